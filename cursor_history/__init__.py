@@ -0,0 +1,4 @@
+"""Cursor 히스토리(User/History) 복구 도구 모음
+
+루트의 restore_*.py 스크립트들이 각자 복사해서 쓰던 로직을 모아둔 패키지입니다.
+"""
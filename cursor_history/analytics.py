@@ -0,0 +1,202 @@
+import re
+import sys
+import time
+import argparse
+from array import array
+from datetime import datetime
+from pathlib import Path
+
+from .index import INDEX_PATH, update_index
+from .paths import decode_file_uri, normalize_path
+from .scan import DEFAULT_FILTER, HISTORY_PATH
+
+DURATION_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 7 * 86400}
+
+
+def require_numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("분석 기능에는 numpy 가 필요합니다: pip install numpy")
+    return numpy
+
+
+def parse_duration(text):
+    """'15m', '1h', '1d' 같은 문자열을 밀리초로"""
+    match = re.fullmatch(r'(\d+(?:\.\d+)?)([smhdw])', text.strip().lower())
+    if not match:
+        raise ValueError(f"기간 형식이 잘못되었습니다: {text} (예: 30m, 1h, 1d)")
+    return int(float(match.group(1)) * DURATION_UNITS[match.group(2)] * 1000)
+
+
+def load_timeline(index, path_filter=DEFAULT_FILTER):
+    """인덱스의 버전 시간을 배열로 읽기
+
+    반환값: {'timestamps': int64 (ms), 'file_ids': int32, 'paths': [파일 경로]}
+    레코드 dict 를 만들지 않고 인덱스 항목에서 바로 배열을 채웁니다.
+    """
+    np = require_numpy()
+    timestamps = array('q')
+    file_ids = array('i')
+    paths = []
+    path_ids = {}
+    for item in index['dirs'].values():
+        if not item['resource'] or not item['entries']:
+            continue
+        file_path = decode_file_uri(item['resource'])
+        if not file_path:
+            continue
+        if path_filter is not None and not path_filter.match_path(file_path):
+            continue
+        key = normalize_path(file_path)
+        file_id = path_ids.get(key)
+        if file_id is None:
+            file_id = path_ids[key] = len(paths)
+            paths.append(str(file_path))
+        entries = item['entries']
+        if path_filter is not None and path_filter.has_size_bounds:
+            entries = [e for e in entries if path_filter.match_size(e[3])]
+        timestamps.extend(e[1] for e in entries)
+        file_ids.extend([file_id] * len(entries))
+    return {
+        'timestamps': np.frombuffer(timestamps, dtype=np.int64),
+        'file_ids': np.frombuffer(file_ids, dtype=np.int32),
+        'paths': paths,
+    }
+
+
+def select_range(timeline, since=None, until=None):
+    """since <= 시간 < until (datetime) 인 버전만 남긴 timeline"""
+    np = require_numpy()
+    ts = timeline['timestamps']
+    mask = np.ones(len(ts), dtype=bool)
+    if since is not None:
+        mask &= ts >= int(since.timestamp() * 1000)
+    if until is not None:
+        mask &= ts < int(until.timestamp() * 1000)
+    return {'timestamps': ts[mask], 'file_ids': timeline['file_ids'][mask], 'paths': timeline['paths']}
+
+
+def local_offset_ms():
+    return time.localtime().tm_gmtoff * 1000
+
+
+def histogram(timeline, bucket_ms, offset_ms=None):
+    """bucket_ms 간격(현지 시간 기준으로 정렬)의 편집 횟수, (구간 시작 ms 배열, 개수 배열)
+
+    편집이 있는 구간만 반환하므로 간격이 작고 기간이 길어도 메모리는 버전 수에만 비례합니다.
+    """
+    np = require_numpy()
+    ts = timeline['timestamps']
+    if not len(ts):
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    offset_ms = local_offset_ms() if offset_ms is None else offset_ms
+    buckets, counts = np.unique((ts + offset_ms) // bucket_ms, return_counts=True)
+    return buckets * bucket_ms - offset_ms, counts
+
+
+def file_churn(timeline):
+    """파일별 버전 수 (timeline['paths'] 순서)"""
+    np = require_numpy()
+    return np.bincount(timeline['file_ids'], minlength=len(timeline['paths']))
+
+
+def directory_churn(timeline, depth=None):
+    """디렉토리별 버전 수, ([디렉토리], 개수 배열)
+
+    depth 를 주면 그 깊이까지의 상위 디렉토리로 묶습니다.
+    """
+    np = require_numpy()
+    dir_ids = {}
+    dirs = []
+    dir_of_file = np.empty(len(timeline['paths']), dtype=np.int32)
+    for i, path in enumerate(timeline['paths']):
+        parts = str(path).replace('\\', '/').split('/')[:-1]
+        if depth is not None:
+            parts = parts[:depth]
+        key = '/'.join(parts)
+        dir_id = dir_ids.get(key)
+        if dir_id is None:
+            dir_id = dir_ids[key] = len(dirs)
+            dirs.append(key)
+        dir_of_file[i] = dir_id
+    counts = np.bincount(dir_of_file, weights=file_churn(timeline), minlength=len(dirs))
+    return dirs, counts.astype(np.int64)
+
+
+def active_intervals(timeline, gap_ms):
+    """편집 사이 간격이 gap_ms 이하인 구간들, (시작 ms, 끝 ms, 버전 수) 배열"""
+    np = require_numpy()
+    ts = np.sort(timeline['timestamps'])
+    if not len(ts):
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty
+    breaks = np.flatnonzero(np.diff(ts) > gap_ms)
+    first = np.concatenate(([0], breaks + 1))
+    last = np.concatenate((breaks, [len(ts) - 1]))
+    return ts[first], ts[last], last - first + 1
+
+
+def top(counts, n):
+    """큰 순서대로 n 개의 위치"""
+    np = require_numpy()
+    n = min(n, len(counts))
+    if n <= 0:
+        return np.empty(0, dtype=np.int64)
+    idx = np.argpartition(-counts, n - 1)[:n]
+    return idx[np.argsort(-counts[idx], kind='stable')]
+
+
+def _fmt(ms):
+    return datetime.fromtimestamp(ms / 1000).strftime('%Y-%m-%d %H:%M')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="히스토리 편집 통계 (시간대별 편집 수, 많이 바뀐 파일/폴더, 작업 구간)")
+    parser.add_argument('--history', default=str(HISTORY_PATH))
+    parser.add_argument('--index', default=str(INDEX_PATH))
+    parser.add_argument('--bucket', default='1h', help="히스토그램 간격 (예: 15m, 1h, 1d)")
+    parser.add_argument('--gap', default='30m', help="이 간격보다 오래 쉬면 작업 구간을 나눔")
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--depth', type=int, default=None, help="폴더 통계를 묶을 깊이")
+    parser.add_argument('--since', type=datetime.fromisoformat)
+    parser.add_argument('--until', type=datetime.fromisoformat)
+    args = parser.parse_args(argv)
+
+    try:
+        require_numpy()
+    except ImportError as e:
+        print(f"[오류] {e}")
+        return 1
+
+    index = update_index(Path(args.history), Path(args.index))
+    timeline = select_range(load_timeline(index), args.since, args.until)
+    print(f"버전 {len(timeline['timestamps'])}개, 파일 {len(timeline['paths'])}개")
+
+    print("\n시간대별 편집 수:")
+    print("-" * 70)
+    starts, counts = histogram(timeline, parse_duration(args.bucket))
+    for start, count in zip(starts, counts):
+        print(f"  {_fmt(start)}: {count}개")
+
+    print(f"\n많이 바뀐 파일 (상위 {args.top}개):")
+    print("-" * 70)
+    churn = file_churn(timeline)
+    for i in top(churn, args.top):
+        print(f"  {churn[i]:6d}  {timeline['paths'][i]}")
+
+    print(f"\n많이 바뀐 폴더 (상위 {args.top}개):")
+    print("-" * 70)
+    dirs, dir_counts = directory_churn(timeline, args.depth)
+    for i in top(dir_counts, args.top):
+        print(f"  {dir_counts[i]:6d}  {dirs[i]}")
+
+    print("\n작업 구간:")
+    print("-" * 70)
+    for start, end, count in zip(*active_intervals(timeline, parse_duration(args.gap))):
+        print(f"  {_fmt(start)} ~ {_fmt(end)}  ({count}개 버전)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from .profiling import span
+from .scan import (
+    DEFAULT_FILTER, HISTORY_PATH, list_history_dirs, scan_history_dir, scan_history_dir_throttled, sort_records,
+)
+
+# 동시에 진행할 디렉토리 수 (네트워크 공유 폴더는 지연이 커서 넉넉하게)
+DEFAULT_CONCURRENCY = 32
+
+
+async def scan_history_async(history_path=HISTORY_PATH, path_filter=DEFAULT_FILTER,
+                             concurrency=DEFAULT_CONCURRENCY, throttle=None):
+    """히스토리를 여러 디렉토리 동시에 스캔 (SMB/NFS 공유 폴더용)
+
+    디렉토리 하나의 처리는 scan_history_dir 과 같으므로 결과 레코드도 순차 스캔과 같습니다.
+    최대 concurrency 개의 디렉토리만 동시에 처리합니다.
+    throttle 을 주면 모든 작업 스레드가 같은 한도(초당 작업 수/바이트)를 나눠 씁니다.
+    """
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        exists = await loop.run_in_executor(executor, history_path.exists)
+        if not exists:
+            print(f"히스토리 경로를 찾을 수 없습니다: {history_path}")
+            return []
+
+        with span('scan'):
+            history_dirs = await loop.run_in_executor(executor, list_history_dirs, history_path)
+        print(f"총 {len(history_dirs)}개 히스토리 디렉토리 스캔 중... (동시 {concurrency}개)")
+
+        pending = iter(history_dirs)
+        records = []
+
+        async def worker():
+            for history_dir in pending:
+                if throttle:
+                    scanned = await loop.run_in_executor(
+                        executor, scan_history_dir_throttled, history_dir, path_filter, throttle)
+                else:
+                    scanned = await loop.run_in_executor(executor, scan_history_dir, history_dir, path_filter)
+                records.extend(scanned)
+
+        await asyncio.gather(*(worker() for _ in range(min(concurrency, len(history_dirs)))))
+
+    with span('group'):
+        return sort_records(records)
+
+
+def scan_history_concurrent(history_path=HISTORY_PATH, path_filter=DEFAULT_FILTER,
+                            concurrency=DEFAULT_CONCURRENCY, throttle=None):
+    """scan_history_async 를 동기 코드에서 호출"""
+    return asyncio.run(scan_history_async(history_path, path_filter, concurrency, throttle))
@@ -0,0 +1,309 @@
+import os
+import sys
+import mmap
+import struct
+import argparse
+from bisect import bisect_left
+from datetime import datetime
+from pathlib import Path
+
+from .paths import decode_file_uri, normalize_path
+from .provenance import PROVENANCES, classify_source
+
+BINARY_MAGIC = b'CHIX'
+BINARY_VERSION = 3
+
+# 헤더: magic, 버전, resource 수, 버전 수, history_path 문자열, 각 구역 시작 위치
+HEADER = struct.Struct('<4sIIII4xQQQQ')
+# resource 표 (정규화 경로 순 정렬): 정규화 경로, 원래 경로, 첫 버전 번호, 버전 수
+RESOURCE = struct.Struct('<IIII')
+# 뒤집은 정규화 경로 순으로 정렬한 resource 번호 (상대 경로를 뒷부분 일치로 이진 탐색)
+SUFFIX = struct.Struct('<I')
+# 버전 배열 (resource 별로 연속, 시간순): timestamp(ms), 크기, 디렉토리 이름, entry id, source, 편집 종류
+VERSION = struct.Struct('<qQIIIB3x')
+TIMESTAMP = struct.Struct('<q')
+PROVENANCE_OFFSET = 28
+# 문자열 풀: [길이 u32][utf-8], 문자열 번호는 풀 안의 위치
+LENGTH = struct.Struct('<I')
+NO_STRING = 0xFFFFFFFF
+
+
+class _StringPool:
+    def __init__(self):
+        self.data = bytearray()
+        self.offsets = {}
+
+    def add(self, text):
+        if text is None:
+            return NO_STRING
+        offset = self.offsets.get(text)
+        if offset is None:
+            encoded = text.encode('utf-8')
+            offset = len(self.data)
+            self.data += LENGTH.pack(len(encoded)) + encoded
+            self.offsets[text] = offset
+        return offset
+
+
+def write_binary_index(index, path):
+    """JSON 인덱스(index.py)를 고정 레이아웃 바이너리 파일로 저장
+
+    같은 파일의 여러 히스토리 디렉토리는 하나의 resource 로 합치고 버전은 시간순으로 둡니다.
+    """
+    files = {}
+    for name, item in index['dirs'].items():
+        if not item['resource'] or not item['entries']:
+            continue
+        file_path = decode_file_uri(item['resource'])
+        if not file_path:
+            continue
+        key = normalize_path(file_path)
+        _, versions = files.setdefault(key, (str(file_path), []))
+        for entry_id, timestamp, source, size, description in item['entries']:
+            versions.append((timestamp, name, entry_id, source, size,
+                             PROVENANCES.index(classify_source(source, description))))
+
+    pool = _StringPool()
+    history_ref = pool.add(index['history_path'])
+    resources = bytearray()
+    versions_data = bytearray()
+    count = 0
+    # 바이트 순으로 정렬해야 mmap 위에서 bytes 비교로 이진 탐색할 수 있다
+    keys = sorted(files, key=lambda k: k.encode('utf-8'))
+    for key in keys:
+        file_path, versions = files[key]
+        versions.sort()
+        resources += RESOURCE.pack(pool.add(key), pool.add(file_path), count, len(versions))
+        for timestamp, name, entry_id, source, size, provenance in versions:
+            versions_data += VERSION.pack(timestamp, size, pool.add(name), pool.add(entry_id), pool.add(source),
+                                          provenance)
+        count += len(versions)
+
+    suffixes = bytearray()
+    for position in sorted(range(len(keys)), key=lambda i: keys[i].encode('utf-8')[::-1]):
+        suffixes += SUFFIX.pack(position)
+
+    resources_start = HEADER.size
+    suffixes_start = resources_start + len(resources)
+    versions_start = suffixes_start + len(suffixes)
+    pool_start = versions_start + len(versions_data)
+    header = HEADER.pack(BINARY_MAGIC, BINARY_VERSION, len(files), count, history_ref,
+                         resources_start, suffixes_start, versions_start, pool_start)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + '.tmp')
+    with open(tmp, 'wb') as f:
+        f.write(header)
+        f.write(resources)
+        f.write(suffixes)
+        f.write(versions_data)
+        f.write(pool.data)
+    os.replace(tmp, path)
+    return len(files), count
+
+
+def binary_index_current(path):
+    """path 가 지금 형식(BINARY_VERSION)의 바이너리 인덱스인지 (헤더만 읽음)"""
+    try:
+        with open(path, 'rb') as f:
+            magic, version = struct.unpack('<4sI', f.read(8))
+    except (OSError, struct.error):
+        return False
+    return magic == BINARY_MAGIC and version == BINARY_VERSION
+
+
+class _Timestamps:
+    """resource 한 개의 timestamp 열을 bisect 에 넘기기 위한 시퀀스 (필요한 칸만 읽음)"""
+
+    def __init__(self, buffer, start, count):
+        self.buffer = buffer
+        self.start = start
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        return TIMESTAMP.unpack_from(self.buffer, self.start + i * VERSION.size)[0]
+
+
+class BinaryIndex:
+    """mmap 으로 연 바이너리 인덱스
+
+    여는 동안 헤더만 읽으므로 히스토리 크기와 관계없이 바로 열리고,
+    질의는 resource 표와 버전 배열을 이진 탐색하면서 필요한 칸만 읽습니다.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self.resource_count, self.version_count, history_ref,
+         self.resources_start, self.suffixes_start, self.versions_start, self.pool_start) = HEADER.unpack_from(
+            self.buffer)
+        if magic != BINARY_MAGIC or version != BINARY_VERSION:
+            self.buffer.close()
+            raise ValueError(f"바이너리 인덱스 형식이 아닙니다: {path}")
+        self.history_path = Path(self.string(history_ref))
+
+    def close(self):
+        self.buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.resource_count
+
+    def _string_bytes(self, ref):
+        start = self.pool_start + ref
+        length = LENGTH.unpack_from(self.buffer, start)[0]
+        return self.buffer[start + LENGTH.size:start + LENGTH.size + length]
+
+    def string(self, ref):
+        if ref == NO_STRING:
+            return None
+        return self._string_bytes(ref).decode('utf-8')
+
+    def resource(self, position):
+        """(정규화 경로, 원래 경로, 첫 버전 번호, 버전 수)"""
+        key_ref, path_ref, first, count = RESOURCE.unpack_from(
+            self.buffer, self.resources_start + position * RESOURCE.size)
+        return self.string(key_ref), self.string(path_ref), first, count
+
+    def _key_bytes(self, position):
+        key_ref = RESOURCE.unpack_from(self.buffer, self.resources_start + position * RESOURCE.size)[0]
+        return self._string_bytes(key_ref)
+
+    def find(self, file_path):
+        """정확히 일치하는 resource 위치 (없으면 None), 문자열 풀 bytes 비교로 이진 탐색"""
+        target = normalize_path(file_path).encode('utf-8')
+        lo, hi = 0, self.resource_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key_bytes(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.resource_count and self._key_bytes(lo) == target:
+            return lo
+        return None
+
+    def _suffix_position(self, rank):
+        """뒤집은 경로 순서로 rank 번째인 resource 위치"""
+        return SUFFIX.unpack_from(self.buffer, self.suffixes_start + rank * SUFFIX.size)[0]
+
+    def find_suffix(self, file_path):
+        """상대 경로(src/pages/home/page.tsx)로 찾기
+
+        정확히 일치하지 않으면 뒤집은 경로 표에서 뒤집은 '/상대 경로' 로 시작하는 구간을 이진 탐색합니다.
+        """
+        position = self.find(file_path)
+        if position is not None:
+            return position
+        target = ('/' + normalize_path(file_path).lstrip('/')).encode('utf-8')[::-1]
+        lo, hi = 0, self.resource_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key_bytes(self._suffix_position(mid))[::-1] < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        matches = []
+        while lo < self.resource_count:
+            position = self._suffix_position(lo)
+            if not self._key_bytes(position)[::-1].startswith(target):
+                break
+            matches.append(position)
+            lo += 1
+        if len(matches) > 1:
+            names = ', '.join(sorted(self.resource(i)[0] for i in matches))
+            raise ValueError(f"여러 파일과 일치합니다: {names}")
+        return matches[0] if matches else None
+
+    def version(self, number):
+        """버전 하나: (timestamp(ms), 크기, 디렉토리 이름, entry id, source, 편집 종류)"""
+        timestamp, size, dir_ref, id_ref, source_ref, provenance = VERSION.unpack_from(
+            self.buffer, self.versions_start + number * VERSION.size)
+        return (timestamp, size, self.string(dir_ref), self.string(id_ref), self.string(source_ref),
+                PROVENANCES[provenance])
+
+    def provenance(self, number):
+        """버전의 편집 종류만 읽기 (문자열 풀을 읽지 않음)"""
+        return PROVENANCES[self.buffer[self.versions_start + number * VERSION.size + PROVENANCE_OFFSET]]
+
+    def versions(self, position):
+        """resource 의 버전 목록 (오래된 순)"""
+        _, _, first, count = self.resource(position)
+        return [self.version(first + i) for i in range(count)]
+
+    def latest(self, position, before_ms=None, match=None):
+        """before_ms 이전 가장 최신 버전 번호 (없으면 None)
+
+        match(편집 종류) 를 주면 조건에 맞는 버전이 나올 때까지 거슬러 올라갑니다.
+        """
+        _, _, first, count = self.resource(position)
+        if before_ms is None:
+            i = count
+        else:
+            i = bisect_left(_Timestamps(self.buffer, self.versions_start + first * VERSION.size, count), before_ms)
+        while i:
+            if match is None or match(self.provenance(first + i - 1)):
+                return first + i - 1
+            i -= 1
+        return None
+
+    def history_file(self, version):
+        return self.history_path / version[2] / version[3]
+
+
+def main(argv=None):
+    from .index import INDEX_PATH, binary_index_path
+    from .provenance import add_provenance_arguments, provenance_from_args
+
+    parser = argparse.ArgumentParser(description="바이너리 인덱스에서 파일 버전 바로 찾기 (인덱스 갱신 없음)")
+    parser.add_argument('file', help="예: src/pages/home/page.tsx")
+    parser.add_argument('--before', type=datetime.fromisoformat, help="이 시간 이전 최신 버전")
+    parser.add_argument('--all-versions', action='store_true', help="모든 버전 출력")
+    add_provenance_arguments(parser)
+    parser.add_argument('--index', default=str(INDEX_PATH))
+    args = parser.parse_args(argv)
+
+    try:
+        binary = BinaryIndex(binary_index_path(args.index))
+    except (OSError, ValueError) as e:
+        print(f"[오류] 바이너리 인덱스를 열 수 없습니다 ({e}). 인덱스를 쓰는 명령(scan 제외)을 한 번 실행하세요.")
+        return 1
+
+    with binary:
+        try:
+            position = binary.find_suffix(args.file)
+        except ValueError as e:
+            print(f"[오류] {e}")
+            return 1
+        if position is None:
+            print(f"[오류] {args.file} 의 히스토리가 없습니다.")
+            return 1
+        _, file_path, first, count = binary.resource(position)
+        print(f"[파일] {file_path} (버전 {count}개)")
+        match = provenance_from_args(args)
+        if args.all_versions:
+            numbers = [n for n in range(first, first + count) if match is None or match(binary.provenance(n))]
+        else:
+            number = binary.latest(position, int(args.before.timestamp() * 1000) if args.before else None, match)
+            if number is None:
+                print("해당하는 버전이 없습니다.")
+                return 1
+            numbers = [number]
+        for number in numbers:
+            version = binary.version(number)
+            print(f"   {datetime.fromtimestamp(version[0] / 1000).strftime('%Y-%m-%d %H:%M:%S')}"
+                  f"  {version[5]:<9}  {binary.history_file(version)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
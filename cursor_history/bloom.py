@@ -0,0 +1,129 @@
+import os
+import sys
+import math
+import struct
+import hashlib
+import argparse
+from pathlib import Path
+
+from .paths import decode_file_uri, normalize_path
+
+BLOOM_MAGIC = b'CHBF'
+# magic, 해시 수, 비트 수, 항목 수
+BLOOM_HEADER = struct.Struct('<4sIQQ')
+FALSE_POSITIVE_RATE = 0.01
+
+
+class BloomFilter:
+    """정규화한 resource 경로의 Bloom filter
+
+    '히스토리가 없음'은 확실하고, '있음'은 FALSE_POSITIVE_RATE 확률로 틀릴 수 있으므로
+    있다고 나오면 인덱스에서 다시 확인합니다. 경로 10만 개에 약 120KB 입니다.
+    """
+
+    def __init__(self, bit_count, hash_count, bits=None, item_count=0):
+        self.bit_count = bit_count
+        self.hash_count = hash_count
+        self.bits = bytearray(bits) if bits is not None else bytearray((bit_count + 7) // 8)
+        self.item_count = item_count
+
+    @classmethod
+    def for_capacity(cls, capacity, false_positive_rate=FALSE_POSITIVE_RATE):
+        capacity = max(capacity, 1)
+        bit_count = max(64, math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        hash_count = max(1, round(bit_count / capacity * math.log(2)))
+        return cls(bit_count, hash_count)
+
+    def _positions(self, path):
+        # 128비트 해시 하나를 둘로 나눠 k 개 위치를 만든다 (double hashing)
+        digest = hashlib.blake2b(normalize_path(path).encode('utf-8'), digest_size=16).digest()
+        h1, h2 = struct.unpack('<QQ', digest)
+        return ((h1 + i * h2) % self.bit_count for i in range(self.hash_count))
+
+    def add(self, path):
+        for position in self._positions(path):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.item_count += 1
+
+    def __contains__(self, path):
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(path))
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + '.tmp')
+        with open(tmp, 'wb') as f:
+            f.write(BLOOM_HEADER.pack(BLOOM_MAGIC, self.hash_count, self.bit_count, self.item_count))
+            f.write(self.bits)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        magic, hash_count, bit_count, item_count = BLOOM_HEADER.unpack_from(data)
+        if magic != BLOOM_MAGIC:
+            raise ValueError(f"Bloom filter 파일이 아닙니다: {path}")
+        return cls(bit_count, hash_count, data[BLOOM_HEADER.size:], item_count)
+
+
+def build_bloom_filter(index, false_positive_rate=FALSE_POSITIVE_RATE):
+    """JSON 인덱스(index.py)의 resource 경로로 Bloom filter 만들기 (버전이 있는 resource 만)"""
+    paths = set()
+    for item in index['dirs'].values():
+        if not item['resource'] or not item['entries']:
+            continue
+        file_path = decode_file_uri(item['resource'])
+        if file_path:
+            paths.add(normalize_path(file_path))
+    bloom = BloomFilter.for_capacity(len(paths), false_positive_rate)
+    for path in paths:
+        bloom.add(path)
+    return bloom
+
+
+def main(argv=None):
+    from .binindex import BinaryIndex
+    from .index import INDEX_PATH, binary_index_path, bloom_filter_path
+    from .scan import PROJECT_PATH
+    from .tree_bisect import SKIP_DIRS
+
+    parser = argparse.ArgumentParser(description="작업 트리 파일 중 히스토리가 있는/없는 파일 확인")
+    parser.add_argument('--project', default=str(PROJECT_PATH))
+    parser.add_argument('--prefix', default='src', help="확인할 폴더 (프로젝트 기준)")
+    parser.add_argument('--missing', action='store_true', help="히스토리가 없는 파일 목록 출력")
+    parser.add_argument('--index', default=str(INDEX_PATH))
+    args = parser.parse_args(argv)
+
+    try:
+        bloom = BloomFilter.load(bloom_filter_path(args.index))
+        binary = BinaryIndex(binary_index_path(args.index))
+    except (OSError, ValueError) as e:
+        print(f"[오류] 인덱스를 열 수 없습니다 ({e}). 인덱스를 쓰는 명령을 한 번 실행하세요.")
+        return 1
+
+    root = Path(args.project) / args.prefix if args.prefix else Path(args.project)
+    tracked, missing, false_positives = [], [], 0
+    with binary:
+        for dirpath, dirs, names in os.walk(root):
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+            for name in names:
+                path = os.path.join(dirpath, name)
+                if path not in bloom:
+                    missing.append(path)
+                elif binary.find(path) is None:
+                    false_positives += 1
+                    missing.append(path)
+                else:
+                    tracked.append(path)
+
+    if args.missing:
+        for path in sorted(missing):
+            print(f"  {path}")
+    print(f"히스토리 있음 {len(tracked)}개, 없음 {len(missing)}개 (인덱스 확인 {len(tracked) + false_positives}번)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+import sys
+import argparse
+from datetime import datetime
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+
+from .filters import compile_filter
+from .index import INDEX_PATH, load_index, refresh_index, save_index
+from .paths import decode_file_uri
+from .scan import HISTORY_PATH, PROJECT_KEYWORD
+from .snapshot import open_snapshot
+
+# 미리보기로 읽는 최대 크기
+PREVIEW_BYTES = 64 * 1024
+
+
+class ResourcePager:
+    """인덱스의 resource 목록을 필요한 만큼만 만들어 주는 페이지 조회
+
+    전체를 정렬하지 않고 인덱스 순서대로 읽어가므로 첫 화면은 인덱스 크기와 관계없이 바로 나옵니다.
+    """
+
+    def __init__(self, index, path_filter=None):
+        self.history_path = Path(index['history_path'])
+        self.path_filter = path_filter
+        self.rows = []
+        self._items = iter(index['dirs'].items())
+        self.exhausted = False
+
+    def _rows(self):
+        for name, item in self._items:
+            if not item['resource'] or not item['entries']:
+                continue
+            file_path = decode_file_uri(item['resource'])
+            if not file_path:
+                continue
+            if self.path_filter is not None and not self.path_filter.match_path(file_path):
+                continue
+            yield {
+                'file_path': file_path,
+                'history_dir': self.history_path / name,
+                'entries': item['entries'],
+                'latest': max(e[1] for e in item['entries']),
+            }
+
+    def fetch(self, count):
+        """최소 count 개의 행이 준비될 때까지 읽기"""
+        if not self.exhausted and len(self.rows) < count:
+            new_rows = list(islice(self._rows(), count - len(self.rows)))
+            if len(new_rows) < count - len(self.rows):
+                self.exhausted = True
+            self.rows.extend(new_rows)
+        return self.rows[:count]
+
+
+def versions_of(row):
+    """resource 의 버전 목록 (최신순), 각 항목은 (시간, 스냅샷 경로, source)"""
+    versions = [(datetime.fromtimestamp(ts / 1000), row['history_dir'] / entry_id, source)
+                for entry_id, ts, source, *_ in row['entries']]
+    versions.sort(key=lambda x: x[0], reverse=True)
+    return versions
+
+
+@lru_cache(maxsize=64)
+def preview_lines(history_file):
+    """스냅샷 앞부분의 줄 목록 (포커스된 버전만 읽음)"""
+    try:
+        with open_snapshot(history_file) as view:
+            text = str(view[:PREVIEW_BYTES], 'utf-8', 'replace')
+    except OSError as e:
+        return [f"[읽기 실패] {e}"]
+    return text.expandtabs(4).splitlines()
+
+
+def _fmt(dt):
+    return dt.strftime('%Y-%m-%d %H:%M:%S')
+
+
+class Browser:
+    def __init__(self, index, keyword=PROJECT_KEYWORD):
+        self.index = index
+        self.set_filter(keyword)
+
+    def set_filter(self, keyword):
+        self.keyword = keyword
+        self.pager = ResourcePager(self.index, compile_filter(keywords=[keyword]) if keyword else None)
+        self.cursor = 0
+        self.top = 0
+        self.row = None
+        self.versions = None
+        self.version_cursor = 0
+
+    def draw(self, screen):
+        import curses
+        screen.erase()
+        height, width = screen.getmaxyx()
+        list_width = max(20, width * 2 // 5)
+        body = height - 2
+
+        if self.versions is None:
+            rows = self.pager.fetch(self.top + body + 1)
+            title = f" 파일 ({len(rows)}{'' if self.pager.exhausted else '+'})  필터: {self.keyword or '-'}"
+            screen.addnstr(0, 0, title, width - 1, curses.A_BOLD)
+            for y, row in enumerate(rows[self.top:self.top + body]):
+                attr = curses.A_REVERSE if self.top + y == self.cursor else curses.A_NORMAL
+                screen.addnstr(y + 1, 0, str(row['file_path']).ljust(list_width), list_width - 1, attr)
+            if rows:
+                focused = rows[self.cursor]
+                for y, (dt, _, source) in enumerate(versions_of(focused)[:body]):
+                    screen.addnstr(y + 1, list_width + 1, f"{_fmt(dt)}  {source or ''}", width - list_width - 2)
+        else:
+            title = f" {self.row['file_path']}  버전 {len(self.versions)}개"
+            screen.addnstr(0, 0, title, width - 1, curses.A_BOLD)
+            start = max(0, self.version_cursor - body + 1)
+            for y, (dt, _, source) in enumerate(self.versions[start:start + body]):
+                attr = curses.A_REVERSE if start + y == self.version_cursor else curses.A_NORMAL
+                screen.addnstr(y + 1, 0, f"{_fmt(dt)} {source or ''}".ljust(list_width), list_width - 1, attr)
+            if self.versions:
+                history_file = self.versions[self.version_cursor][1]
+                for y, line in enumerate(preview_lines(history_file)[:body]):
+                    screen.addnstr(y + 1, list_width + 1, line, width - list_width - 2)
+
+        help_text = " ↑↓/PgUp/PgDn 이동  Enter 버전 보기  ← 뒤로  / 필터  q 종료"
+        screen.addnstr(height - 1, 0, help_text, width - 1, curses.A_DIM)
+        screen.refresh()
+
+    def move(self, delta, body):
+        if self.versions is None:
+            rows = self.pager.fetch(max(self.cursor + delta, 0) + 1)
+            self.cursor = min(max(self.cursor + delta, 0), max(len(rows) - 1, 0))
+            if self.cursor < self.top:
+                self.top = self.cursor
+            elif self.cursor >= self.top + body:
+                self.top = self.cursor - body + 1
+        else:
+            self.version_cursor = min(max(self.version_cursor + delta, 0), max(len(self.versions) - 1, 0))
+
+    def prompt(self, screen, label):
+        import curses
+        height, width = screen.getmaxyx()
+        screen.move(height - 1, 0)
+        screen.clrtoeol()
+        screen.addnstr(height - 1, 0, label, width - 1)
+        curses.echo()
+        curses.curs_set(1)
+        try:
+            text = screen.getstr(height - 1, len(label), 200).decode('utf-8', 'replace')
+        finally:
+            curses.noecho()
+            curses.curs_set(0)
+        return text.strip()
+
+    def run(self, screen):
+        import curses
+        curses.curs_set(0)
+        screen.keypad(True)
+        while True:
+            self.draw(screen)
+            body = screen.getmaxyx()[0] - 2
+            key = screen.getch()
+            if key in (ord('q'), 27):
+                if self.versions is None:
+                    return
+                self.versions = None
+            elif key in (curses.KEY_DOWN, ord('j')):
+                self.move(1, body)
+            elif key in (curses.KEY_UP, ord('k')):
+                self.move(-1, body)
+            elif key == curses.KEY_NPAGE:
+                self.move(body, body)
+            elif key == curses.KEY_PPAGE:
+                self.move(-body, body)
+            elif key in (curses.KEY_ENTER, 10, 13, curses.KEY_RIGHT) and self.versions is None:
+                rows = self.pager.fetch(self.cursor + 1)
+                if rows:
+                    self.row = rows[self.cursor]
+                    self.versions = versions_of(self.row)
+                    self.version_cursor = 0
+            elif key in (curses.KEY_LEFT, curses.KEY_BACKSPACE, 127):
+                self.versions = None
+            elif key == ord('/'):
+                self.set_filter(self.prompt(screen, "필터(경로 키워드): "))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="히스토리 인덱스 탐색기")
+    parser.add_argument('--history', default=str(HISTORY_PATH))
+    parser.add_argument('--index', default=str(INDEX_PATH))
+    parser.add_argument('--keyword', default=PROJECT_KEYWORD, help="경로 키워드 필터 (빈 문자열이면 전체)")
+    parser.add_argument('--refresh', action='store_true', help="시작 전에 인덱스 갱신 (없으면 저장된 인덱스 그대로 사용)")
+    args = parser.parse_args(argv)
+
+    try:
+        import curses
+    except ImportError:
+        print("[오류] curses 모듈이 없습니다. Windows 에서는 pip install windows-curses")
+        return 1
+
+    history_path = Path(args.history)
+    index = load_index(Path(args.index), history_path)
+    if args.refresh or not index['dirs']:
+        refresh_index(index, history_path)
+        save_index(index, Path(args.index))
+
+    curses.wrapper(Browser(index, args.keyword).run)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+from pathlib import Path
+
+from .index import list_dir_mtimes
+from .paths import decode_file_uri
+from .scan import make_record, scan_history_dir, sort_records
+
+CHECKPOINT_ROOT = Path.home() / '.cursor_history' / 'checkpoints'
+SCAN_STATE_NAME = 'scan.json'
+RESTORED_NAME = 'restored.txt'
+# scan.json 형식이 바뀌면 올림 (형식이 다른 저장 상태는 버리고 처음부터 스캔)
+STATE_VERSION = 3
+# 이 간격(초)마다 스캔 위치와 중간 결과를 저장
+SAVE_INTERVAL = 5.0
+
+
+class Checkpoint:
+    """중단된 스캔/복구를 이어서 하기 위한 상태
+
+    같은 조건(params)으로 다시 실행하면 같은 폴더를 쓰므로 자동으로 이어집니다.
+    - scan.json: 처리한 히스토리 디렉토리별 mtime 과 찾은 버전 (mtime 이 같은 디렉토리만 다시 씀)
+    - restored.txt: 복구를 마친 대상 경로 (한 줄에 하나, 추가만 함)
+    끝까지 마치면 clear() 로 지웁니다.
+    """
+
+    def __init__(self, params, root=CHECKPOINT_ROOT):
+        key = hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+        self.path = Path(root) / key
+        self.params = params
+        self._restored_file = None
+
+    def exists(self):
+        return self.path.exists()
+
+    def clear(self):
+        self.close()
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def load_scan(self):
+        """{디렉토리 이름: [mtime_ns, 결과(_compact) 또는 None]}, 저장된 것이 없으면 {}"""
+        try:
+            with open(self.path / SCAN_STATE_NAME, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if state.get('version') != STATE_VERSION:
+            return {}
+        return state['dirs']
+
+    def save_scan(self, dirs):
+        self.path.mkdir(parents=True, exist_ok=True)
+        tmp = self.path / (SCAN_STATE_NAME + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'version': STATE_VERSION, 'params': self.params, 'dirs': dirs},
+                      f, ensure_ascii=False, default=str)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path / SCAN_STATE_NAME)
+
+    def restored_targets(self):
+        try:
+            with open(self.path / RESTORED_NAME, 'r', encoding='utf-8') as f:
+                return {line.rstrip('\n') for line in f if line.endswith('\n')}
+        except OSError:
+            return set()
+
+    def mark_restored(self, target_path):
+        if self._restored_file is None:
+            self.path.mkdir(parents=True, exist_ok=True)
+            self._restored_file = open(self.path / RESTORED_NAME, 'a', encoding='utf-8')
+        self._restored_file.write(f"{target_path}\n")
+        self._restored_file.flush()
+
+    def close(self):
+        if self._restored_file is not None:
+            self._restored_file.close()
+            self._restored_file = None
+
+
+def _compact(records):
+    """한 디렉토리의 레코드를 저장용으로 줄이기: [디렉토리, resource, [[id, ms, source, 크기, sourceDescription]]]"""
+    first = records[0]
+    return [str(first['history_dir']), first['resource'],
+            [[r['entry_id'], r['entry'].get('timestamp', 0), r['source'], r['size'],
+              r['entry'].get('sourceDescription')] for r in records]]
+
+
+def _expand(item):
+    history_dir, resource, entries = item
+    history_dir = Path(history_dir)
+    file_path = decode_file_uri(resource)
+    records = []
+    for entry_id, timestamp, source, size, description in entries:
+        entry = {'id': entry_id, 'timestamp': timestamp}
+        if source is not None:
+            entry['source'] = source
+        if description is not None:
+            entry['sourceDescription'] = description
+        records.append(make_record(history_dir, resource, file_path, entry, size))
+    return records
+
+
+def scan_history_checkpointed(history_path, path_filter, checkpoint, save_interval=SAVE_INTERVAL):
+    """scan_history 와 같은 결과, save_interval 초마다 처리한 디렉토리와 중간 결과를 저장
+
+    디렉토리는 이름과 mtime 으로 기억하므로 실행 사이에 디렉토리가 생기거나 지워져도 빠뜨리거나 두 번 읽지 않고,
+    끝까지 마친 스캔도 mtime 이 바뀐 디렉토리는 다시 읽습니다 (index.py 와 같은 방식).
+    중단(Ctrl-C 포함)되면 그때까지의 결과를 저장하고 예외를 그대로 올립니다.
+    """
+    if not history_path.exists():
+        print(f"히스토리 경로를 찾을 수 없습니다: {history_path}")
+        return []
+
+    mtimes = list_dir_mtimes(history_path)
+    saved = checkpoint.load_scan()
+    dirs = {name: saved[name] for name in mtimes if name in saved and saved[name][0] == mtimes[name]}
+    pending = sorted(name for name in mtimes if name not in dirs)
+    if dirs:
+        print(f"총 {len(mtimes)}개 히스토리 디렉토리 중 {len(dirs)}개는 저장된 결과 사용, {len(pending)}개 스캔 중...")
+    else:
+        print(f"총 {len(mtimes)}개 히스토리 디렉토리 스캔 중...")
+
+    last_save = time.monotonic()
+    try:
+        for name in pending:
+            records = scan_history_dir(history_path / name, path_filter)
+            dirs[name] = [mtimes[name], _compact(records) if records else None]
+            if time.monotonic() - last_save >= save_interval:
+                checkpoint.save_scan(dirs)
+                last_save = time.monotonic()
+    except BaseException:
+        checkpoint.save_scan(dirs)
+        print(f"\n스캔 중단: {len(dirs)}/{len(mtimes)} 디렉토리까지 저장했습니다. 같은 명령으로 이어서 실행하세요.")
+        raise
+    if pending or len(saved) != len(dirs):
+        checkpoint.save_scan(dirs)
+    return sort_records([r for _, item in dirs.values() if item for r in _expand(item)])
+
+
+def resume_plan(plan, checkpoint):
+    """복구 계획에서 이미 복구한 대상 빼기"""
+    done = checkpoint.restored_targets()
+    if not done:
+        return plan
+    remaining = [(record, target) for record, target in plan if str(target) not in done]
+    print(f"이전 실행에서 {len(plan) - len(remaining)}개 파일을 이미 복구했습니다. 나머지 {len(remaining)}개를 복구합니다.")
+    return remaining
+
+
+def checkpointed_restore(restore, checkpoint):
+    """복구에 성공한 대상을 checkpoint 에 기록하는 restore 함수 (journal/conflicts 의 restore 인자로 사용)"""
+    def run(file_info, target_path):
+        restored = restore(file_info, target_path)
+        if restored:
+            checkpoint.mark_restored(target_path)
+        return restored
+    return run
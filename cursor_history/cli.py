@@ -0,0 +1,104 @@
+import sys
+
+# 하위 명령: (모듈, 앞에 붙일 인자, 설명)
+# 모듈은 해당 명령을 실행할 때만 import 하므로 --help 나 가벼운 명령은 numpy/pyarrow/sqlite3 를 읽지 않습니다.
+COMMANDS = {
+    'scan': ('scan', [], "히스토리에 있는 파일과 버전 수 보기"),
+    'plan': ('restore', ['--dry-run'], "복구할 파일 목록만 보기 (restore --dry-run)"),
+    'restore': ('restore', [], "히스토리에서 프로젝트 파일 복구"),
+    'deleted': ('deleted', [], "작업 트리에서 지워진 파일 찾기/복구"),
+    'diff': ('diff', [], "히스토리 버전과 현재 파일 비교"),
+    'lookup': ('binindex', [], "바이너리 인덱스에서 파일 버전 바로 찾기 (갱신 없음)"),
+    'coverage': ('bloom', [], "작업 트리 파일 중 히스토리가 없는 파일 확인"),
+    'search': ('search', [], "모든 히스토리 버전에서 문자열 검색"),
+    'export': ('export', [], "히스토리 인덱스를 Parquet/Arrow 로 내보내기"),
+    'stats': ('analytics', [], "편집 시간대/파일별 통계"),
+    'browse': ('browser', [], "터미널에서 히스토리 둘러보기"),
+    'bisect': ('file_bisect', [], "파일 한 개의 버전 중 조건을 만족하는 마지막 버전 찾기"),
+    'tree-bisect': ('tree_bisect', [], "프로젝트 전체가 검사를 통과한 마지막 시점 찾기"),
+    'compact': ('compact', [], "중복/대체된 스냅샷 정리"),
+    'journal': ('journal', [], "복구 저널 목록 보기와 되돌리기"),
+    'shard': ('shard', [], "히스토리를 여러 프로세스/컴퓨터로 나눠 인덱싱"),
+    'serve': ('server', [], "인덱스를 메모리에 두고 질의에 답하는 서버 실행"),
+    'query': ('client', [], "인덱스 서버에 질의 (latest, plan, export)"),
+    'selfcheck': (None, [], "명령 시작 시간(import 시간) 점검"),
+}
+
+# selfcheck 에서 검사하는 명령과 허용 import 시간 (cursor_history 모듈 누적, ms)
+IMPORT_BUDGET_MS = 30
+STARTUP_CHECKS = (
+    ['--help'],
+    ['scan', '--help'],
+    ['plan', '--help'],
+    ['diff', '--help'],
+    ['query', '--help'],
+    ['lookup', '--help'],
+)
+# 가벼운 명령에서 읽히면 안 되는 모듈
+HEAVY_MODULES = ('numpy', 'pyarrow', 'sqlite3', 'curses')
+
+
+def print_usage(file=sys.stdout):
+    print("사용법: cursor-history <명령> [옵션]  (설치하지 않았으면 python -m cursor_history)\n", file=file)
+    print("명령:", file=file)
+    for name, (_, _, description) in COMMANDS.items():
+        print(f"  {name:<12} {description}", file=file)
+    print("\n명령별 옵션: python -m cursor_history <명령> --help", file=file)
+
+
+def measure_imports(argv):
+    """python -X importtime 으로 argv 를 실행해 최상위 import 목록 {모듈: 누적 시간(us)} 반환
+
+    하위 import 는 상위 모듈의 누적 시간에 이미 포함되어 있으므로 들여쓰기 없는 줄만 셉니다.
+    """
+    import subprocess
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-m', 'cursor_history', *argv],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+    )
+    imports = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        imports[name.strip()] = (int(cumulative), name[1:] != name[1:].lstrip())
+    return imports
+
+
+def check_startup(budget_ms=IMPORT_BUDGET_MS, checks=STARTUP_CHECKS):
+    """각 명령의 import 시간이 예산 안인지, 무거운 모듈을 읽지 않는지 확인하고 통과 여부 반환"""
+    passed = True
+    for argv in checks:
+        imports = measure_imports(argv)
+        own_ms = sum(us for name, (us, nested) in imports.items()
+                     if not nested and name.split('.')[0] == 'cursor_history') / 1000
+        heavy = sorted({name.split('.')[0] for name in imports} & set(HEAVY_MODULES))
+        ok = own_ms <= budget_ms and not heavy
+        passed = passed and ok
+        status = '통과' if ok else '초과'
+        extra = f" (무거운 모듈: {', '.join(heavy)})" if heavy else ''
+        print(f"  [{status}] {' '.join(argv):<16} {own_ms:6.1f} ms / {budget_ms} ms{extra}")
+    return passed
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] in ('-h', '--help', 'help'):
+        print_usage()
+        return 0
+
+    name, rest = argv[0], argv[1:]
+    if name not in COMMANDS:
+        print(f"[오류] 알 수 없는 명령: {name}\n", file=sys.stderr)
+        print_usage(sys.stderr)
+        return 2
+
+    if name == 'selfcheck':
+        budget_ms = float(rest[0]) if rest else IMPORT_BUDGET_MS
+        print(f"명령 시작 시간 점검 (cursor_history 모듈 import 예산 {budget_ms} ms)")
+        return 0 if check_startup(budget_ms) else 1
+
+    import importlib
+    module_name, prefix, _ = COMMANDS[name]
+    module = importlib.import_module(f'.{module_name}', __package__)
+    return module.main(prefix + rest)
@@ -0,0 +1,131 @@
+import sys
+import json
+import time
+import socket
+import argparse
+from pathlib import Path
+
+SOCKET_PATH = Path.home() / '.cursor_history' / 'index.sock'
+
+
+class Client:
+    """인덱스 서버 클라이언트 (연결 하나로 여러 요청)
+
+    server.py 를 import 하지 않으므로 질의만 하는 프로세스는 시작이 빠릅니다.
+    """
+
+    def __init__(self, socket_path=SOCKET_PATH, timeout=30):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(str(socket_path))
+        self.reader = self.sock.makefile('rb')
+
+    def request(self, op, **params):
+        self.sock.sendall(json.dumps({'op': op, **params}, ensure_ascii=False).encode('utf-8') + b'\n')
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError("서버가 연결을 끊었습니다.")
+        response = json.loads(line)
+        if not response['ok']:
+            raise RuntimeError(response['error'])
+        return response['result']
+
+    def latest(self, file_path, before=None, after=None, sources=None, exclude_sources=None):
+        """before 이전 가장 최신 버전 (시간은 ISO 문자열), 없으면 None
+
+        sources/exclude_sources 는 편집 종류 목록입니다 (provenance.PROVENANCES, 'human').
+        """
+        return self.request('latest', file=str(file_path), before=before, after=after,
+                            source=sources, exclude_source=exclude_sources)
+
+    def plan(self, project_path, before=None, after=None, globs=None, extensions=None,
+             sources=None, exclude_sources=None):
+        return self.request('plan', project=str(project_path), before=before, after=after,
+                            glob=globs, ext=extensions, source=sources, exclude_source=exclude_sources)
+
+    def export(self, output_path, projects=None, include_all=False):
+        return self.request('export', output=str(Path(output_path).resolve()),
+                            project=[str(p) for p in projects] if projects else None, all=include_all)
+
+    def close(self):
+        self.reader.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="인덱스 서버에 질의")
+    parser.add_argument('--socket', default=str(SOCKET_PATH))
+    sub = parser.add_subparsers(dest='op', required=True)
+    latest = sub.add_parser('latest', help="파일의 시간 T 이전 최신 버전")
+    latest.add_argument('file')
+    latest.add_argument('--before')
+    latest.add_argument('--after')
+    latest.add_argument('--source', action='append', help="이 편집 종류만 (save, undo, agent, workspace, other, human)")
+    latest.add_argument('--exclude-source', action='append', help="이 편집 종류 제외 (예: agent)")
+    plan = sub.add_parser('plan', help="복구 계획")
+    plan.add_argument('--project')
+    plan.add_argument('--before')
+    plan.add_argument('--after')
+    plan.add_argument('--glob', action='append')
+    plan.add_argument('--ext', action='append')
+    plan.add_argument('--source', action='append', help="이 편집 종류만 (save, undo, agent, workspace, other, human)")
+    plan.add_argument('--exclude-source', action='append', help="이 편집 종류 제외 (예: agent)")
+    export = sub.add_parser('export', help="Parquet/Arrow 로 내보내기 (서버가 파일을 씀)")
+    export.add_argument('output')
+    export.add_argument('--project', action='append')
+    export.add_argument('--all', action='store_true')
+    sub.add_parser('stats', help="서버 인덱스 크기")
+    sub.add_parser('refresh', help="지금 바로 갱신")
+    sub.add_parser('shutdown', help="서버 종료")
+    args = parser.parse_args(argv)
+
+    try:
+        client = Client(args.socket)
+    except OSError as e:
+        print(f"[오류] 서버에 연결할 수 없습니다 ({e}). 먼저 python -m cursor_history serve 를 실행하세요.")
+        return 1
+
+    started = time.perf_counter()
+    try:
+        with client:
+            if args.op == 'latest':
+                result = client.latest(args.file, args.before, args.after, args.source, args.exclude_source)
+            elif args.op == 'plan':
+                result = client.plan(args.project, args.before, args.after, args.glob, args.ext,
+                                     args.source, args.exclude_source)
+            elif args.op == 'export':
+                result = client.export(args.output, args.project, args.all)
+            else:
+                result = client.request(args.op)
+    except (RuntimeError, ConnectionError) as e:
+        print(f"[오류] {e}")
+        return 1
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    if args.op == 'latest':
+        if result is None:
+            print("해당하는 버전이 없습니다.")
+            return 1
+        print(f"[파일] {result['file_path']}")
+        print(f"   히스토리 시간: {result['timestamp']} ({result['provenance']})")
+        print(f"   히스토리 파일: {result['history_file']}")
+    elif args.op == 'plan':
+        for item in result:
+            print(f"  {item['timestamp']}  {item['target']}")
+        print(f"복구할 파일 {len(result)}개")
+    elif args.op == 'export':
+        print(f"내보내기 완료: {result}행 -> {args.output}")
+    else:
+        print(json.dumps(result, ensure_ascii=False))
+    print(f"({elapsed_ms:.1f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+import os
+import sys
+import json
+import shutil
+import argparse
+from pathlib import Path
+
+from .analytics import parse_duration
+from .scan import DEFAULT_FILTER, HISTORY_PATH, list_history_dirs, scan_history
+from .snapshot import hash_snapshot
+
+
+def prune_candidates(versions, granularity_ms=None):
+    """한 resource 의 버전 중 지워도 되는 것들
+
+    - 바로 앞에 남긴 버전과 내용이 같은 버전 (같은 내용이 이어지면 가장 오래된 것만 남김)
+    - granularity_ms 를 주면 같은 시간 구간 안에서 마지막 버전만 남김
+    가장 최신 버전은 항상 남깁니다. 크기가 같은 경우에만 내용 해시를 계산합니다.
+    반환값: [(레코드, 이유)]
+    """
+    versions = sorted(versions, key=lambda r: (r['timestamp'], str(r['history_file'])))
+    pruned = []
+    kept = []
+    digests = {}
+
+    def digest(record):
+        key = record['history_file']
+        if key not in digests:
+            digests[key] = hash_snapshot(key)
+        return digests[key]
+
+    for i, record in enumerate(versions):
+        if i == len(versions) - 1:
+            kept.append(record)
+            break
+        if granularity_ms:
+            bucket = int(record['timestamp'].timestamp() * 1000) // granularity_ms
+            next_bucket = int(versions[i + 1]['timestamp'].timestamp() * 1000) // granularity_ms
+            if bucket == next_bucket:
+                pruned.append((record, 'superseded'))
+                continue
+        if kept and kept[-1]['size'] == record['size'] and digest(kept[-1]) == digest(record):
+            pruned.append((record, 'duplicate'))
+            continue
+        kept.append(record)
+    return pruned
+
+
+def empty_history_dirs(history_path, records):
+    """쓸 수 있는 버전이 하나도 없는 디렉토리 (entries.json 이 없거나 깨졌거나 스냅샷이 모두 없음)"""
+    used = {r['history_dir'] for r in records}
+    return [d for d in list_history_dirs(history_path) if d not in used]
+
+
+def archive_versions(history_dir, pruned, archive_path):
+    """스냅샷 파일을 보관 폴더로 옮기고 entries.json 에서 해당 항목을 뺀다
+
+    원래 entries.json 은 보관 폴더에 같이 남깁니다.
+    """
+    target_dir = Path(archive_path) / history_dir.name
+    target_dir.mkdir(parents=True, exist_ok=True)
+    entries_file = history_dir / 'entries.json'
+    shutil.copy2(entries_file, target_dir / 'entries.json')
+
+    with open(entries_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    pruned_ids = {r['entry_id'] for r in pruned}
+    data['entries'] = [e for e in data['entries'] if e.get('id') not in pruned_ids]
+
+    tmp = history_dir / 'entries.json.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(tmp, entries_file)
+
+    for record in pruned:
+        shutil.move(str(record['history_file']), str(target_dir / record['entry_id']))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="중복되거나 대체된 히스토리 스냅샷 정리")
+    parser.add_argument('--history', default=str(HISTORY_PATH))
+    parser.add_argument('--granularity', help="이 구간 안에서는 마지막 버전만 남김 (예: 10m, 1h)")
+    parser.add_argument('--all', action='store_true', help="copydrum 외 다른 프로젝트 파일도 정리")
+    parser.add_argument('--archive', help="정리한 스냅샷을 옮길 폴더 (없으면 목록만 출력)")
+    args = parser.parse_args(argv)
+
+    history_path = Path(args.history)
+    granularity_ms = parse_duration(args.granularity) if args.granularity else None
+    records = scan_history(history_path, None if args.all else DEFAULT_FILTER)
+
+    by_dir = {}
+    for record in records:
+        by_dir.setdefault(record['history_dir'], []).append(record)
+
+    total = {'duplicate': 0, 'superseded': 0}
+    total_bytes = 0
+    plan = []
+    for history_dir, versions in by_dir.items():
+        pruned = prune_candidates(versions, granularity_ms)
+        if not pruned:
+            continue
+        plan.append((history_dir, [r for r, _ in pruned]))
+        for record, reason in pruned:
+            total[reason] += 1
+            total_bytes += record['size']
+        print(f"[파일] {versions[0]['file_path']}: {len(versions)}개 중 {len(pruned)}개 정리")
+
+    empty_dirs = empty_history_dirs(history_path, records) if args.all else []
+
+    print("\n" + "=" * 70)
+    print(f"중복 {total['duplicate']}개, 대체됨 {total['superseded']}개 ({total_bytes / 1024 / 1024:.1f} MB)")
+    if args.all:
+        print(f"쓸 수 있는 버전이 없는 디렉토리 {len(empty_dirs)}개")
+
+    if not args.archive:
+        print("\n--archive 폴더를 지정하면 실제로 옮깁니다. (Cursor 를 종료한 상태에서 실행하세요)")
+        return 0
+
+    archive_path = Path(args.archive)
+    for history_dir, pruned in plan:
+        try:
+            archive_versions(history_dir, pruned, archive_path)
+        except (OSError, ValueError) as e:
+            print(f"  오류: {history_dir} - {e}")
+    for history_dir in empty_dirs:
+        shutil.move(str(history_dir), str(archive_path / history_dir.name))
+    print(f"\n정리 완료: {archive_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,271 @@
+import os
+import json
+import shutil
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .restore import restore_file
+from .snapshot import git_blob_hash, search_snapshot
+
+UNTOUCHED = 'untouched'
+SNAPSHOT_NEWER = 'snapshot-newer'
+LOCALLY_MODIFIED = 'locally-modified'
+DIVERGED = 'diverged'
+MERGED = 'merged'
+# merge_diverged 가 남기는 충돌 표시 (-L local)
+CONFLICT_MARKER = b'<<<<<<< local'
+
+HASH_CACHE_NAME = 'cursor-history-hashes.json'
+# 히스토리 스냅샷 해시 캐시 (프로젝트와 관계없이 공용)
+SNAPSHOT_HASH_CACHE_PATH = Path.home() / '.cursor_history' / 'snapshot-hashes.json'
+
+
+class HashCache:
+    """파일 해시 캐시 (경로, 크기, mtime 이 같으면 다시 읽지 않음)
+
+    해시는 git blob id 형식이라 HEAD 의 ls-tree 결과와 바로 비교할 수 있습니다.
+    HEAD 트리(경로 -> blob id)도 커밋 id 기준으로 함께 저장합니다.
+    """
+
+    def __init__(self, cache_file=None):
+        self.cache_file = cache_file
+        self.files = {}
+        self.tree = {'commit': None, 'blobs': {}}
+        self._lock = threading.Lock()
+        if cache_file and os.path.exists(cache_file):
+            try:
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.files = data.get('files', {})
+                self.tree = data.get('tree', self.tree)
+            except (OSError, ValueError):
+                pass
+
+    def file_hash(self, path):
+        """파일의 git blob 해시, 파일이 없으면 None"""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        digest = self.cached_hash(path, st)
+        if digest is None:
+            digest = git_blob_hash(path)
+            self.store(path, st.st_size, st.st_mtime_ns, digest)
+        return digest
+
+    def cached_hash(self, path, st):
+        """저장된 해시 (크기와 mtime 이 os.stat 결과 st 와 같을 때만), 없으면 None"""
+        cached = self.files.get(str(path))
+        if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            return cached[2]
+        return None
+
+    def store(self, path, size, mtime_ns, digest):
+        with self._lock:
+            self.files[str(path)] = [size, mtime_ns, digest]
+
+    def save(self):
+        if not self.cache_file:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.cache_file)), exist_ok=True)
+        tmp = f"{self.cache_file}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'files': self.files, 'tree': self.tree}, f)
+        os.replace(tmp, self.cache_file)
+
+
+def default_cache_file(project_path):
+    """프로젝트의 .git 폴더 안에 캐시를 둔다 (git 저장소가 아니면 캐시 없음)"""
+    git_dir = os.path.join(project_path, '.git')
+    if os.path.isdir(git_dir):
+        return os.path.join(git_dir, HASH_CACHE_NAME)
+    return None
+
+
+def _git(project_path, *args):
+    return subprocess.run(['git', '-C', str(project_path), *args],
+                          capture_output=True, check=True).stdout
+
+
+def head_blobs(project_path, cache):
+    """HEAD 의 {소문자 상대 경로: blob id}, git 저장소가 아니면 빈 dict"""
+    try:
+        commit = _git(project_path, 'rev-parse', 'HEAD').decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return {}
+    if cache.tree.get('commit') == commit:
+        return cache.tree['blobs']
+
+    blobs = {}
+    output = _git(project_path, 'ls-tree', '-r', '-z', 'HEAD')
+    for item in output.split(b'\0'):
+        if not item:
+            continue
+        meta, path = item.split(b'\t', 1)
+        _, kind, sha = meta.split()
+        if kind == b'blob':
+            blobs[path.decode('utf-8', 'surrogateescape').lower()] = sha.decode()
+    cache.tree = {'commit': commit, 'blobs': blobs}
+    return blobs
+
+
+def _relative_key(target_path, project_path):
+    return os.path.relpath(target_path, project_path).replace('\\', '/').lower()
+
+
+def classify_plan(plan, project_path, cache=None, workers=8):
+    """복구 계획의 각 대상을 스냅샷 / 현재 파일 / git HEAD 세 가지를 비교해서 분류
+
+    - untouched: 현재 파일이 이미 스냅샷과 같음
+    - snapshot-newer: 현재 파일이 HEAD 와 같거나 없음 (덮어써도 잃는 작업 없음)
+    - locally-modified: 스냅샷이 HEAD 와 같고 현재 파일만 바뀜 (스냅샷 이후의 로컬 작업)
+    - diverged: 셋 다 다름
+    - merged: diverged 지만 이미 merge 했음 (.orig 가 있거나 충돌 표시가 남아 있음), 다시 건드리지 않음
+    HEAD 에 없는 파일은 현재 파일 수정 시간이 스냅샷보다 이후면 diverged 로 봅니다.
+    해시는 스레드 풀에서 병렬로 계산하고 cache 에 저장됩니다.
+    """
+    cache = cache or HashCache(default_cache_file(project_path))
+    blobs = head_blobs(project_path, cache)
+
+    def classify(item):
+        record, target_path = item
+        snapshot_hash = cache.file_hash(record['history_file'])
+        local_hash = cache.file_hash(target_path)
+        head_hash = blobs.get(_relative_key(target_path, project_path))
+
+        if local_hash == snapshot_hash:
+            status = UNTOUCHED
+        elif local_hash is None:
+            status = SNAPSHOT_NEWER
+        elif head_hash is not None:
+            if local_hash == head_hash:
+                status = SNAPSHOT_NEWER
+            elif snapshot_hash == head_hash:
+                status = LOCALLY_MODIFIED
+            else:
+                status = DIVERGED
+        elif os.stat(target_path).st_mtime <= record['timestamp'].timestamp():
+            status = SNAPSHOT_NEWER
+        else:
+            status = DIVERGED
+        if status == DIVERGED and already_merged(target_path):
+            status = MERGED
+
+        return {
+            'record': record,
+            'target': target_path,
+            'status': status,
+            'snapshot_hash': snapshot_hash,
+            'local_hash': local_hash,
+            'head_hash': head_hash,
+        }
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(classify, plan))
+    cache.save()
+    return results
+
+
+def orig_path(target_path):
+    return f"{target_path}.orig"
+
+
+def already_merged(target_path):
+    """이전 실행에서 merge 한 파일인지 (.orig 가 있거나 충돌 표시가 남아 있음)"""
+    if os.path.exists(orig_path(target_path)):
+        return True
+    try:
+        return search_snapshot(target_path, CONFLICT_MARKER) != -1
+    except OSError:
+        return False
+
+
+def merge_diverged(result, project_path):
+    """diverged 파일: 현재 파일을 .orig 로 남기고 HEAD 를 base 로 3-way merge 한 결과를 쓴다
+
+    충돌 개수를 반환합니다 (git merge-file 의 종료 코드).
+    .orig 는 merge 가 성공한 뒤에만 만들고, 결과를 쓰다 실패하면 지웁니다 (.orig 가 남으면 merge 된 것으로 보므로).
+    .orig 가 이미 있으면 사용자의 원래 작업이 들어 있을 수 있으므로 덮어쓰지 않고 FileExistsError 를 올립니다.
+    """
+    target_path = result['target']
+    with tempfile.NamedTemporaryFile(delete=False) as base:
+        if result['head_hash']:
+            base.write(_git(project_path, 'cat-file', 'blob', result['head_hash']))
+    try:
+        merged = subprocess.run(
+            ['git', 'merge-file', '-p',
+             '-L', 'local', '-L', 'HEAD', '-L', 'snapshot',
+             str(target_path), base.name, str(result['record']['history_file'])],
+            capture_output=True,
+        )
+    finally:
+        os.unlink(base.name)
+    if merged.returncode > 127:
+        raise RuntimeError(merged.stderr.decode(errors='replace'))
+
+    with open(target_path, 'rb') as src, open(orig_path(target_path), 'xb') as dst:
+        shutil.copyfileobj(src, dst)
+    # 결과는 임시 파일에 쓰고 바꿔치기하므로 실패해도 현재 파일은 그대로
+    tmp = f"{target_path}.merge-tmp"
+    try:
+        shutil.copystat(target_path, orig_path(target_path))
+        with open(tmp, 'wb') as f:
+            f.write(merged.stdout)
+        shutil.copymode(target_path, tmp)
+        os.replace(tmp, target_path)
+    except OSError:
+        for path in (tmp, orig_path(target_path)):
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+        raise
+    return merged.returncode
+
+
+def restore_with_conflicts(plan, project_path, restore=restore_file, cache=None, workers=8, mark_done=None,
+                           journal=None):
+    """충돌을 확인하면서 복구
+
+    snapshot-newer 만 덮어쓰고, untouched/locally-modified/merged 는 그대로 두며,
+    diverged 는 .orig 와 merge 결과를 남깁니다. 분류 결과 목록을 반환합니다.
+    mark_done(대상 경로) 는 merge 한 (또는 이미 merge 된) 대상마다 호출됩니다 (Checkpoint.mark_restored 등).
+    journal(journal.Journal) 을 주면 덮어쓰는 파일과 새로 만드는 .orig 를 기록하므로 rollback 할 수 있습니다.
+    """
+    results = classify_plan(plan, project_path, cache, workers)
+    counts = {}
+    for result in results:
+        status = result['status']
+        counts[status] = counts.get(status, 0) + 1
+        if status == SNAPSHOT_NEWER:
+            if journal:
+                journal.save(result['target'])
+            result['restored'] = restore(result['record'], result['target'])
+        elif status == DIVERGED:
+            if journal:
+                # merge 결과는 os.replace 로 쓰므로 원래 경로를 지우지 않아도 보관본은 그대로
+                journal.save(result['target'], unlink=False)
+                journal.save(orig_path(result['target']), unlink=False)
+            try:
+                result['conflicts'] = merge_diverged(result, project_path)
+                print(f"[충돌] {result['target']} (충돌 {result['conflicts']}개, 원본: .orig)")
+            except FileExistsError:
+                print(f"[건너뜀] {result['target']}: .orig 가 이미 있습니다")
+                result['status'] = MERGED
+            except Exception as e:
+                print(f"  오류: {e}")
+                continue
+            if mark_done:
+                mark_done(result['target'])
+        elif status == MERGED:
+            print(f"[건너뜀] {result['target']}: 이미 merge 됨 (.orig 또는 충돌 표시)")
+            if mark_done:
+                mark_done(result['target'])
+
+    print("\n분류 결과:")
+    for status in (UNTOUCHED, SNAPSHOT_NEWER, LOCALLY_MODIFIED, DIVERGED, MERGED):
+        print(f"  {status}: {counts.get(status, 0)}개 파일")
+    return results
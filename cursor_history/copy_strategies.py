@@ -0,0 +1,102 @@
+import os
+import errno
+import shutil
+
+# linux/fs.h 의 FICLONE (_IOW(0x94, 9, int))
+FICLONE = 0x40049409
+
+# 이 오류들은 "이 방식은 여기서 안 됨" 이므로 다음 방식으로 넘어간다
+UNSUPPORTED_ERRNOS = {
+    errno.EXDEV, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EINVAL, errno.ENOSYS,
+    errno.ENOTTY, errno.EBADF, errno.EPERM,
+}
+
+# 복구용 (대상 파일을 나중에 편집하므로 하드링크는 쓰지 않음)
+DEFAULT_STRATEGIES = ('reflink', 'copy_file_range', 'sendfile', 'buffered')
+
+
+def _reflink(src, dst):
+    """btrfs/xfs 등에서 데이터 블록을 공유하는 복사 (데이터를 읽지 않음)"""
+    try:
+        import fcntl
+    except ImportError:
+        raise OSError(errno.ENOSYS, 'FICLONE 미지원')
+    with open(src, 'rb') as fs, open(dst, 'wb') as fd:
+        fcntl.ioctl(fd.fileno(), FICLONE, fs.fileno())
+
+
+def _copy_file_range(src, dst):
+    """커널 안에서 복사 (사용자 공간을 거치지 않음)"""
+    if not hasattr(os, 'copy_file_range'):
+        raise OSError(errno.ENOSYS, 'copy_file_range 미지원')
+    with open(src, 'rb') as fs, open(dst, 'wb') as fd:
+        remaining = os.fstat(fs.fileno()).st_size
+        while remaining > 0:
+            copied = os.copy_file_range(fs.fileno(), fd.fileno(), remaining)
+            if copied == 0:
+                break
+            remaining -= copied
+
+
+def _sendfile(src, dst):
+    """sendfile 로 커널 안에서 복사"""
+    if not hasattr(os, 'sendfile'):
+        raise OSError(errno.ENOSYS, 'sendfile 미지원')
+    with open(src, 'rb') as fs, open(dst, 'wb') as fd:
+        size = os.fstat(fs.fileno()).st_size
+        offset = 0
+        while offset < size:
+            sent = os.sendfile(fd.fileno(), fs.fileno(), offset, size - offset)
+            if sent == 0:
+                break
+            offset += sent
+
+
+def _hardlink(src, dst):
+    """하드링크 (메타데이터만 씀)"""
+    if os.path.lexists(dst):
+        os.unlink(dst)
+    os.link(src, dst)
+
+
+def _buffered(src, dst):
+    shutil.copyfile(src, dst)
+
+
+STRATEGIES = {
+    'reflink': _reflink,
+    'copy_file_range': _copy_file_range,
+    'sendfile': _sendfile,
+    'hardlink': _hardlink,
+    'buffered': _buffered,
+}
+
+# (방식, 원본 장치, 대상 장치) 중 이미 실패한 조합 (같은 조합은 다시 시도하지 않음)
+_unsupported = set()
+
+
+def copy_snapshot(src, dst, strategies=DEFAULT_STRATEGIES):
+    """strategies 순서대로 시도해서 src 를 dst 로 복사하고, 성공한 방식 이름을 반환
+
+    hardlink 가 아닌 경우 copy2 처럼 권한/시간 메타데이터도 복사합니다.
+    """
+    src_dev = os.stat(src).st_dev
+    if os.path.lexists(dst) and (os.lstat(dst).st_nlink > 1 or os.path.samefile(src, dst)):
+        # 하드링크된 파일을 그대로 열어 쓰면 다른 쪽(히스토리 원본, 작업 트리)도 바뀐다
+        os.unlink(dst)
+    dst_dev = os.stat(os.path.dirname(os.path.abspath(dst))).st_dev
+
+    for name in strategies:
+        if (name, src_dev, dst_dev) in _unsupported:
+            continue
+        try:
+            STRATEGIES[name](src, dst)
+        except OSError as e:
+            if e.errno not in UNSUPPORTED_ERRNOS or name == 'buffered':
+                raise
+            _unsupported.add((name, src_dev, dst_dev))
+            continue
+        if name != 'hardlink':
+            shutil.copystat(src, dst)
+        return name
+    raise OSError(errno.ENOTSUP, f'사용할 수 있는 복사 방식이 없습니다: {strategies}')
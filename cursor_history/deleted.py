@@ -0,0 +1,83 @@
+import os
+import sys
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+from .filters import compile_filter
+from .index import INDEX_PATH, iter_records, update_index
+from .paths import normalize_path
+from .provenance import add_provenance_arguments, provenance_from_args
+from .restore import plan_restore, restore_file
+from .scan import HISTORY_PATH, PROJECT_PATH
+from .tree_bisect import SKIP_DIRS
+
+
+def tree_keys(root, project_path):
+    """작업 트리 파일의 프로젝트 기준 정규화 경로 (정렬됨)"""
+    keys = []
+    for dirpath, dirs, names in os.walk(root):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        for name in names:
+            keys.append(normalize_path(os.path.relpath(os.path.join(dirpath, name), project_path)))
+    keys.sort()
+    return keys
+
+
+def missing_from_tree(plan, keys, project_path):
+    """복구 계획 중 작업 트리에 없는 파일 (두 정렬된 목록을 한 번씩만 훑음)
+
+    plan 은 [(레코드, 대상 경로)], keys 는 tree_keys 결과입니다.
+    """
+    planned = sorted(((normalize_path(os.path.relpath(target, project_path)), record, target)
+                      for record, target in plan), key=lambda x: x[0])
+    missing = []
+    j = 0
+    for key, record, target in planned:
+        while j < len(keys) and keys[j] < key:
+            j += 1
+        if j == len(keys) or keys[j] != key:
+            missing.append((record, target))
+    return missing
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="히스토리에는 있지만 작업 트리에서 지워진 파일 찾기/복구")
+    parser.add_argument('--project', default=str(PROJECT_PATH))
+    parser.add_argument('--prefix', default='src', help="확인할 폴더 (프로젝트 기준, 빈 문자열이면 전체)")
+    parser.add_argument('--before', type=datetime.fromisoformat, help="이 시간 이전의 최신 버전으로 복구")
+    parser.add_argument('--restore', action='store_true', help="지워진 파일을 모두 복구")
+    parser.add_argument('--journal', action='store_true', help="복구 내역을 저널에 남김 (rollback 으로 다시 지울 수 있음)")
+    parser.add_argument('--history', default=str(HISTORY_PATH))
+    parser.add_argument('--index', default=str(INDEX_PATH))
+    add_provenance_arguments(parser)
+    args = parser.parse_args(argv)
+
+    project_path = Path(args.project)
+    root = project_path / args.prefix if args.prefix else project_path
+    index = update_index(Path(args.history), Path(args.index))
+    records = iter_records(index, compile_filter(prefixes=[root], exclude_globs=['**/node_modules/**']))
+    plan = plan_restore(records, project_path, args.before, match=provenance_from_args(args))
+    missing = missing_from_tree(plan, tree_keys(root, project_path), project_path)
+
+    print(f"히스토리에 있는 파일 {len(plan)}개 중 작업 트리에 없는 파일 {len(missing)}개")
+    print("-" * 70)
+    for record, target in sorted(missing, key=lambda x: x[0]['timestamp'], reverse=True):
+        print(f"  {record['timestamp'].strftime('%Y-%m-%d %H:%M:%S')}  {target.relative_to(project_path)}")
+
+    if not missing:
+        return 0
+    if not args.restore:
+        print("\n--restore 를 주면 위 파일을 마지막 버전으로 복구합니다.")
+        return 0
+    if args.journal:
+        from .journal import restore_journaled
+        restore_journaled(missing, project_path)
+    else:
+        restored = sum(restore_file(record, target) for record, target in missing)
+        print(f"\n복구 완료: {restored}/{len(missing)} 파일")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
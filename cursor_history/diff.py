@@ -0,0 +1,63 @@
+import os
+import sys
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+from .index import INDEX_PATH, file_versions, iter_records, update_index
+from .scan import HISTORY_PATH
+from .snapshot import diff_snapshots
+
+
+def pick_version(versions, before=None):
+    """before 이전의 가장 최신 버전 (versions 는 오래된 순), 없으면 None"""
+    for record in reversed(versions):
+        if before is None or record['timestamp'] < before:
+            return record
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="히스토리 버전과 현재 파일(또는 이전 버전) 비교")
+    parser.add_argument('file', help="예: src/pages/home/page.tsx")
+    parser.add_argument('--before', type=datetime.fromisoformat, help="이 시간 이전의 최신 버전과 비교")
+    parser.add_argument('--previous', action='store_true', help="현재 파일 대신 바로 앞 버전과 비교")
+    parser.add_argument('--context', type=int, default=3)
+    parser.add_argument('--history', default=str(HISTORY_PATH))
+    parser.add_argument('--index', default=str(INDEX_PATH))
+    args = parser.parse_args(argv)
+
+    index = update_index(Path(args.history), Path(args.index))
+    try:
+        versions = file_versions(iter_records(index, None), args.file)
+    except ValueError as e:
+        print(f"[오류] {e}")
+        return 1
+    record = pick_version(versions, args.before)
+    if record is None:
+        print(f"[오류] {args.file} 의 히스토리가 없습니다.")
+        return 1
+
+    label = f"{record['timestamp'].strftime('%Y-%m-%d %H:%M:%S')} {record['entry_id']}"
+    if args.previous:
+        i = versions.index(record)
+        if i == 0:
+            print("[오류] 이전 버전이 없습니다.")
+            return 1
+        previous = versions[i - 1]
+        old_path = previous['history_file']
+        old_label = f"{previous['timestamp'].strftime('%Y-%m-%d %H:%M:%S')} {previous['entry_id']}"
+        lines = diff_snapshots(old_path, record['history_file'], old_label, label, args.context)
+    else:
+        current = record['file_path']
+        current_path = current if os.path.exists(current) else os.devnull
+        lines = diff_snapshots(record['history_file'], current_path, label, str(current), args.context)
+
+    for line in lines:
+        # 마지막 줄에 줄바꿈이 없는 파일도 줄 단위로 보이도록
+        sys.stdout.write(line if line.endswith('\n') else line + '\n')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+import sys
+import argparse
+from pathlib import Path
+
+from .conflicts import SNAPSHOT_HASH_CACHE_PATH, HashCache
+from .index import INDEX_PATH, iter_records, update_index
+from .paths import ProjectRouter
+from .scan import DEFAULT_FILTER, HISTORY_PATH, PROJECT_PATH
+
+# 한 번에 쓰는 행 수 (메모리 사용량은 이 크기에 비례)
+BATCH_ROWS = 65536
+
+
+def require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("내보내기에는 pyarrow 가 필요합니다: pip install pyarrow")
+    return pyarrow
+
+
+def export_schema():
+    pa = require_pyarrow()
+    return pa.schema([
+        ('resource', pa.string()),
+        ('project', pa.string()),
+        ('relative_path', pa.string()),
+        ('entry_id', pa.string()),
+        ('timestamp', pa.timestamp('ms')),
+        ('source', pa.string()),
+        ('provenance', pa.string()),
+        ('size', pa.int64()),
+        ('digest', pa.string()),
+    ])
+
+
+def _is_parquet(path):
+    return Path(path).suffix.lower() in ('.parquet', '.pq')
+
+
+def iter_batches(records, router=None, hash_cache=None, batch_rows=BATCH_ROWS):
+    """레코드를 batch_rows 개씩 RecordBatch 로 (전체를 메모리에 올리지 않음)
+
+    hash_cache 를 주면 스냅샷 내용 해시(git blob id)를 digest 열에 넣습니다.
+    """
+    pa = require_pyarrow()
+    schema = export_schema()
+    columns = {name: [] for name in schema.names}
+
+    def flush():
+        batch = pa.RecordBatch.from_arrays(
+            [pa.array(columns[name], type=schema.field(name).type) for name in schema.names],
+            schema=schema,
+        )
+        for values in columns.values():
+            values.clear()
+        return batch
+
+    for record in records:
+        project, relative_path = router.route(record['file_path']) if router else (None, None)
+        columns['resource'].append(record['resource'])
+        columns['project'].append(project)
+        columns['relative_path'].append(str(relative_path) if relative_path else None)
+        columns['entry_id'].append(record['entry_id'])
+        columns['timestamp'].append(record['entry'].get('timestamp', 0))
+        columns['source'].append(record['source'])
+        columns['provenance'].append(record['provenance'])
+        columns['size'].append(record['size'])
+        columns['digest'].append(hash_cache.file_hash(record['history_file']) if hash_cache else None)
+        if len(columns['resource']) >= batch_rows:
+            yield flush()
+    if columns['resource']:
+        yield flush()
+
+
+def export_index(records, output_path, router=None, hash_cache=None, batch_rows=BATCH_ROWS):
+    """레코드를 Parquet(.parquet) 또는 Arrow IPC(.arrow/.feather) 파일로 쓰고 행 수를 반환"""
+    pa = require_pyarrow()
+    schema = export_schema()
+    rows = 0
+    if _is_parquet(output_path):
+        writer = pa.parquet.ParquetWriter(str(output_path), schema, compression='zstd')
+    else:
+        writer = pa.ipc.new_file(str(output_path), schema)
+    try:
+        for batch in iter_batches(records, router, hash_cache, batch_rows):
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    finally:
+        writer.close()
+    return rows
+
+
+def load_export(path):
+    """내보낸 파일을 memory map 으로 읽어 pyarrow.Table 반환
+
+    Arrow IPC 파일은 복사 없이 매핑된 버퍼를 그대로 씁니다.
+    """
+    pa = require_pyarrow()
+    if _is_parquet(path):
+        return pa.parquet.read_table(str(path), memory_map=True)
+    with pa.memory_map(str(path), 'r') as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="히스토리 인덱스를 Parquet/Arrow 로 내보내기")
+    parser.add_argument('output', help="출력 파일 (.parquet 또는 .arrow)")
+    parser.add_argument('--history', default=str(HISTORY_PATH))
+    parser.add_argument('--index', default=str(INDEX_PATH))
+    parser.add_argument('--project', action='append', help="상대 경로 계산에 쓸 프로젝트 루트 (여러 번 지정 가능)")
+    parser.add_argument('--all', action='store_true', help="copydrum 외 다른 프로젝트 파일도 포함")
+    parser.add_argument('--digest', action='store_true', help="스냅샷 내용 해시 포함 (처음에는 모든 스냅샷을 읽음)")
+    args = parser.parse_args(argv)
+
+    try:
+        require_pyarrow()
+    except ImportError as e:
+        print(f"[오류] {e}")
+        return 1
+
+    index = update_index(Path(args.history), Path(args.index))
+    router = ProjectRouter(args.project or [PROJECT_PATH])
+    hash_cache = HashCache(str(SNAPSHOT_HASH_CACHE_PATH)) if args.digest else None
+    records = iter_records(index, None if args.all else DEFAULT_FILTER)
+    rows = export_index(records, Path(args.output), router, hash_cache)
+    if hash_cache:
+        hash_cache.save()
+    print(f"내보내기 완료: {rows}행 -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
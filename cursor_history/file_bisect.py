@@ -0,0 +1,182 @@
+import re
+import sys
+import json
+import argparse
+import importlib
+from datetime import datetime
+from pathlib import Path
+
+from .conflicts import SNAPSHOT_HASH_CACHE_PATH, HashCache
+from .index import INDEX_PATH, file_versions, iter_records, update_index
+from .scan import HISTORY_PATH
+from .snapshot import open_snapshot
+
+PREDICATE_CACHE_PATH = Path.home() / '.cursor_history' / 'predicates.json'
+
+
+class Predicate:
+    """스냅샷 내용 조건 + 내용 해시별 결과 캐시
+
+    key 가 있으면(문자열/정규식 조건) 결과를 파일에 저장해서 다음 실행에도 재사용합니다.
+    """
+
+    def __init__(self, test, key=None, cache_path=PREDICATE_CACHE_PATH, hash_cache=None):
+        self.test = test
+        self.key = key
+        self.cache_path = cache_path if key else None
+        self.hash_cache = hash_cache or HashCache(str(SNAPSHOT_HASH_CACHE_PATH))
+        self.results = {}
+        self.evaluated = 0
+        if self.cache_path and Path(self.cache_path).exists():
+            try:
+                with open(self.cache_path, 'r', encoding='utf-8') as f:
+                    self.results = json.load(f).get(key, {})
+            except (OSError, ValueError):
+                pass
+
+    def __call__(self, record):
+        digest = self.hash_cache.file_hash(record['history_file'])
+        if digest is None:
+            return False
+        if digest not in self.results:
+            with open_snapshot(record['history_file']) as view:
+                self.results[digest] = bool(self.test(view))
+            self.evaluated += 1
+        return self.results[digest]
+
+    def save(self):
+        self.hash_cache.save()
+        if not self.cache_path:
+            return
+        data = {}
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            pass
+        data[self.key] = self.results
+        Path(self.cache_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+
+
+def contains(text):
+    needle = text.encode('utf-8')
+    return Predicate(lambda view: view.obj.find(needle) >= 0, f'contains:{text}')
+
+
+def absent(text):
+    needle = text.encode('utf-8')
+    return Predicate(lambda view: view.obj.find(needle) < 0, f'absent:{text}')
+
+
+def matches(pattern):
+    regex = re.compile(pattern.encode('utf-8'), re.MULTILINE)
+    return Predicate(lambda view: regex.search(view) is not None, f'regex:{pattern}')
+
+
+def from_callable(spec):
+    """'모듈:함수' 형식, 함수는 스냅샷 bytes 를 받아 True/False 를 반환
+
+    함수는 실행 사이에 바뀔 수 있으므로 결과는 이번 실행 동안 메모리에만 둡니다.
+    """
+    module_name, _, func_name = spec.partition(':')
+    func = getattr(importlib.import_module(module_name), func_name)
+    return Predicate(lambda view: func(view.tobytes()))
+
+
+def bisect_last(versions, predicate, good=None):
+    """조건을 만족하는 가장 최신 버전 (versions 는 오래된 순)
+
+    good(조건을 만족한다고 알려진 버전의 위치)이 없으면 최신 버전부터 거꾸로 하나씩 검사합니다.
+    조건은 내용 해시별로 캐시되므로 같은 내용의 버전은 다시 검사하지 않습니다.
+    good 을 주면 versions[good] 부터 최신 버전까지는 만족...만족 불만족...불만족 이라고 보고 이진 탐색합니다.
+    versions[good] 이 만족하지 않으면 None 입니다.
+    """
+    if not versions:
+        return None
+    if predicate(versions[-1]):
+        return versions[-1]
+    if good is None:
+        for record in reversed(versions[:-1]):
+            if predicate(record):
+                return record
+        return None
+    if not predicate(versions[good]):
+        return None
+    lo, hi = good, len(versions) - 1  # versions[lo] 는 만족, versions[hi] 는 불만족
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if predicate(versions[mid]):
+            lo = mid
+        else:
+            hi = mid
+    return versions[lo]
+
+
+def good_position(versions, good_time):
+    """good_time 이전(포함)의 가장 최신 버전 위치, 없으면 None"""
+    position = None
+    for i, record in enumerate(versions):
+        if record['timestamp'] <= good_time:
+            position = i
+    return position
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="파일 한 개의 버전 중 조건을 만족하는 가장 최신 버전 찾기")
+    parser.add_argument('file', help="예: src/pages/home/page.tsx")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument('--contains', help="이 문자열을 아직 포함하는 가장 최신 버전")
+    group.add_argument('--absent', help="이 문자열이 나타나기 직전 버전")
+    group.add_argument('--regex', help="정규식과 일치하는 가장 최신 버전")
+    group.add_argument('--call', help="모듈:함수 (스냅샷 bytes -> bool)")
+    parser.add_argument('--before', type=datetime.fromisoformat, help="이 시간 이전 버전만")
+    parser.add_argument('--good', type=datetime.fromisoformat,
+                        help="이 시간의 버전은 조건을 만족함 (그 이후만 이진 탐색, 없으면 최신부터 차례로 검사)")
+    parser.add_argument('--history', default=str(HISTORY_PATH))
+    parser.add_argument('--index', default=str(INDEX_PATH))
+    args = parser.parse_args(argv)
+
+    if args.contains is not None:
+        predicate = contains(args.contains)
+    elif args.absent is not None:
+        predicate = absent(args.absent)
+    elif args.regex is not None:
+        predicate = matches(args.regex)
+    else:
+        predicate = from_callable(args.call)
+
+    index = update_index(Path(args.history), Path(args.index))
+    try:
+        versions = file_versions(iter_records(index, None), args.file)
+    except ValueError as e:
+        print(f"[오류] {e}")
+        return 1
+    if args.before:
+        versions = [v for v in versions if v['timestamp'] < args.before]
+    if not versions:
+        print(f"[오류] {args.file} 의 히스토리가 없습니다.")
+        return 1
+
+    good = None
+    if args.good:
+        good = good_position(versions, args.good)
+        if good is None:
+            print(f"[오류] {args.good} 이전 버전이 없습니다.")
+            return 1
+
+    found = bisect_last(versions, predicate, good)
+    predicate.save()
+    print(f"버전 {len(versions)}개 중 {predicate.evaluated}개 검사")
+    if found is None:
+        print("조건을 만족하는 버전이 없습니다.")
+        return 1
+    print(f"\n[파일] {found['file_path']}")
+    print(f"   히스토리 시간: {found['timestamp'].strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"   히스토리 파일: {found['history_file']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+import re
+
+from .paths import normalize_path
+
+
+def glob_to_regex(pattern, anchored=False):
+    """glob 패턴을 정규식 문자열로 변환
+
+    `*` 와 `?` 는 경로 구분자(/)를 넘지 않고, `**` 는 여러 단계 디렉토리와 일치합니다.
+    패턴이 / 로 시작하지 않으면 경로의 어느 디렉토리 경계에서 시작해도 일치합니다 (anchored 이면 처음부터).
+    """
+    pattern = normalize_path(pattern)
+    parts = []
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if pattern.startswith('**/', i):
+            parts.append('(?:.*/)?')
+            i += 3
+            continue
+        if pattern.startswith('**', i):
+            parts.append('.*')
+            i += 2
+            continue
+        if c == '*':
+            parts.append('[^/]*')
+        elif c == '?':
+            parts.append('[^/]')
+        else:
+            parts.append(re.escape(c))
+        i += 1
+    body = ''.join(parts)
+    if anchored or _is_absolute_glob(pattern):
+        return body
+    return '(?:^|.*/)' + body
+
+
+def _is_absolute_glob(pattern):
+    pattern = normalize_path(pattern)
+    return pattern.startswith('/') or re.match(r'^[a-z]:/', pattern) is not None
+
+
+def _is_rooted_glob(pattern):
+    """프로젝트 루트 기준으로 맞출 상대 패턴인지 (.gitignore 처럼 / 가 들어 있는 패턴, **/ 로 시작하는 것 제외)"""
+    pattern = normalize_path(pattern)
+    return '/' in pattern and not pattern.startswith('**/') and not _is_absolute_glob(pattern)
+
+
+class PathFilter:
+    """한 번 컴파일해서 여러 경로에 반복 적용하는 필터
+
+    경로 조건(match_path)은 파일을 건드리지 않고 문자열만으로 판단하므로
+    entries.json 의 resource 를 디코딩한 직후에 적용할 수 있습니다.
+    크기 조건(match_size)은 스냅샷 목록을 읽을 때 적용합니다.
+    조건끼리는 AND, 한 조건 안의 여러 값은 OR 입니다.
+    prefixes(프로젝트 루트)가 있으면 / 가 들어 있는 상대 glob(src/** 등)은 가장 깊은 루트 기준 상대 경로의
+    처음부터 맞춥니다 (node_modules/x/src/... 나 다른 프로젝트의 src 와 일치하지 않도록).
+    *.tsx 나 **/node_modules/** 처럼 / 가 없거나 **/ 로 시작하는 패턴은 어느 단계에서나 일치합니다.
+    """
+
+    def __init__(self, extensions=None, globs=None, prefixes=None, keywords=None,
+                 exclude_globs=None, min_size=None, max_size=None):
+        extensions = [e.lower() if e.startswith('.') else '.' + e.lower()
+                      for e in (extensions or [])]
+        # '.d.ts' 처럼 점이 두 개 이상인 확장자는 endswith 로, 나머지는 집합으로 비교
+        self.extensions = {e for e in extensions if e.count('.') == 1} or None
+        self.compound_extensions = tuple(e for e in extensions if e.count('.') > 1) or None
+        self.prefixes = tuple(normalize_path(p) + '/' for p in prefixes) if prefixes else None
+        self.glob_re, self.relative_glob_re = self._split_globs(globs)
+        self.exclude_re, self.relative_exclude_re = self._split_globs(exclude_globs)
+        self.keyword_re = (re.compile('|'.join(re.escape(k.lower()) for k in keywords))
+                           if keywords else None)
+        self.min_size = min_size
+        self.max_size = max_size
+
+    @staticmethod
+    def _compile_globs(globs):
+        if not globs:
+            return None
+        return re.compile('(?:' + '|'.join(glob_to_regex(g) for g in globs) + r')\Z')
+
+    def _split_globs(self, globs):
+        """(절대 경로에 맞출 정규식, 루트 기준 상대 경로에 맞출 정규식)"""
+        if not globs or not self.prefixes:
+            return self._compile_globs(globs), None
+        rooted = [g for g in globs if _is_rooted_glob(g)]
+        relative_re = None
+        if rooted:
+            relative_re = re.compile('(?:' + '|'.join(glob_to_regex(g, anchored=True) for g in rooted) + r')\Z')
+        return self._compile_globs([g for g in globs if not _is_rooted_glob(g)]), relative_re
+
+    def _relative_key(self, key):
+        """가장 깊은(긴) prefix 기준 상대 경로"""
+        key = key + '/'
+        prefix = max((p for p in self.prefixes if key.startswith(p)), key=len)
+        return key[len(prefix):-1]
+
+    @staticmethod
+    def _globs_match(key, absolute_re, relative_re, relative_key):
+        if absolute_re is not None and absolute_re.match(key):
+            return True
+        return relative_re is not None and relative_re.match(relative_key()) is not None
+
+    @property
+    def has_size_bounds(self):
+        return self.min_size is not None or self.max_size is not None
+
+    def match_path(self, path):
+        """경로 조건 검사 (I/O 없음)"""
+        key = normalize_path(path)
+        if self.prefixes and not (key + '/').startswith(self.prefixes):
+            return False
+        if self.extensions or self.compound_extensions:
+            name = key.rsplit('/', 1)[-1]
+            dot = name.rfind('.')
+            ext = name[dot:] if dot > 0 else ''
+            if not ((self.extensions and ext in self.extensions)
+                    or (self.compound_extensions and name.endswith(self.compound_extensions))):
+                return False
+        if self.keyword_re and not self.keyword_re.search(key):
+            return False
+        if self.glob_re or self.relative_glob_re:
+            if not self._globs_match(key, self.glob_re, self.relative_glob_re, lambda: self._relative_key(key)):
+                return False
+        if self.exclude_re or self.relative_exclude_re:
+            if self._globs_match(key, self.exclude_re, self.relative_exclude_re, lambda: self._relative_key(key)):
+                return False
+        return True
+
+    def match_size(self, size):
+        """크기 조건 검사"""
+        if self.min_size is not None and size < self.min_size:
+            return False
+        if self.max_size is not None and size > self.max_size:
+            return False
+        return True
+
+
+def compile_filter(extensions=None, globs=None, prefixes=None, keywords=None,
+                   exclude_globs=None, min_size=None, max_size=None):
+    """PathFilter 생성 (조건을 하나도 주지 않으면 모든 경로와 일치)"""
+    return PathFilter(extensions, globs, prefixes, keywords, exclude_globs, min_size, max_size)
@@ -0,0 +1,159 @@
+import os
+import json
+import time
+from pathlib import Path
+
+from .binindex import binary_index_current, write_binary_index
+from .bloom import build_bloom_filter
+from .paths import decode_file_uri, normalize_path
+from .scan import DEFAULT_FILTER, HISTORY_PATH, make_record, scan_history_dir
+
+INDEX_PATH = Path.home() / '.cursor_history' / 'index.json'
+INDEX_VERSION = 2
+
+
+def new_index(history_path=HISTORY_PATH):
+    return {'version': INDEX_VERSION, 'history_path': str(history_path), 'dirs': {}}
+
+
+def load_index(index_path=INDEX_PATH, history_path=HISTORY_PATH):
+    """저장된 인덱스 읽기 (없거나 다른 히스토리 폴더의 인덱스면 빈 인덱스)"""
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return new_index(history_path)
+    if index.get('version') != INDEX_VERSION or index.get('history_path') != str(history_path):
+        return new_index(history_path)
+    return index
+
+
+def binary_index_path(index_path=INDEX_PATH):
+    """JSON 인덱스 옆에 같이 저장하는 바이너리 인덱스 경로 (index.json -> index.bin)"""
+    return Path(index_path).with_suffix('.bin')
+
+
+def bloom_filter_path(index_path=INDEX_PATH):
+    """resource 경로 Bloom filter 경로 (index.json -> index.bloom)"""
+    return Path(index_path).with_suffix('.bloom')
+
+
+def save_index(index, index_path=INDEX_PATH):
+    """JSON 인덱스와 바이너리 인덱스(binindex.py), Bloom filter(bloom.py)를 같이 저장"""
+    index_path = Path(index_path)
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = index_path.with_name(index_path.name + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp, index_path)
+    write_binary_index(index, binary_index_path(index_path))
+    build_bloom_filter(index).save(bloom_filter_path(index_path))
+
+
+def list_dir_mtimes(history_path=HISTORY_PATH):
+    """{디렉토리 이름: mtime_ns}"""
+    with os.scandir(history_path) as it:
+        return {e.name: e.stat().st_mtime_ns for e in it if e.is_dir()}
+
+
+def index_history_dir(history_dir, mtime_ns):
+    """디렉토리 하나의 인덱스 항목 (필터 없이 모든 resource 를 저장)
+
+    entries 는 [entry id, timestamp(ms), source, 크기, sourceDescription] 목록입니다.
+    resource 가 없는 디렉토리도 빈 항목으로 남겨서 다음 갱신 때 다시 읽지 않게 합니다.
+    """
+    records = scan_history_dir(history_dir, None)
+    return {
+        'mtime_ns': mtime_ns,
+        'resource': records[0]['resource'] if records else None,
+        'entries': [[r['entry_id'], r['entry'].get('timestamp', 0), r['source'], r['size'],
+                     r['entry'].get('sourceDescription')] for r in records],
+    }
+
+
+def refresh_index(index, history_path=HISTORY_PATH, throttle=None):
+    """mtime 이 바뀐 디렉토리만 다시 읽어 인덱스 갱신, (추가, 변경, 삭제) 개수 반환
+
+    Cursor 는 스냅샷을 추가할 때 같은 디렉토리에 파일을 만들고 entries.json 을 다시 쓰므로
+    디렉토리 mtime 만으로 변경 여부를 알 수 있습니다.
+    throttle(throttle.Throttle)을 주면 디렉토리마다 한도를 지키고 걸린 시간을 알려줍니다.
+    """
+    dirs = index['dirs']
+    mtimes = list_dir_mtimes(history_path)
+    added = updated = 0
+    for name, mtime_ns in mtimes.items():
+        cached = dirs.get(name)
+        if cached and cached['mtime_ns'] == mtime_ns:
+            continue
+        history_dir = os.path.join(history_path, name)
+        if throttle:
+            try:
+                nbytes = os.stat(os.path.join(history_dir, 'entries.json')).st_size
+            except OSError:
+                nbytes = 0
+            # entries.json 읽기 + 디렉토리 목록 읽기
+            throttle.wait(2, nbytes)
+            started = time.monotonic()
+        dirs[name] = index_history_dir(history_dir, mtime_ns)
+        if throttle:
+            throttle.record(time.monotonic() - started)
+        if cached:
+            updated += 1
+        else:
+            added += 1
+    removed = [name for name in dirs if name not in mtimes]
+    for name in removed:
+        del dirs[name]
+    return added, updated, len(removed)
+
+
+def update_index(history_path=HISTORY_PATH, index_path=INDEX_PATH, throttle=None):
+    """인덱스를 읽고, 바뀐 부분만 갱신하고, 저장"""
+    index = load_index(index_path, history_path)
+    added, updated, removed = refresh_index(index, history_path, throttle)
+    derived = (binary_index_path(index_path), bloom_filter_path(index_path))
+    if (added or updated or removed or not all(p.exists() for p in derived)
+            or not binary_index_current(derived[0])):
+        save_index(index, index_path)
+    print(f"인덱스 갱신: 추가 {added}, 변경 {updated}, 삭제 {removed} (전체 {len(index['dirs'])}개 디렉토리)")
+    return index
+
+
+def iter_records(index, path_filter=DEFAULT_FILTER):
+    """인덱스에서 레코드 만들기 (scan_history_dir 과 같은 형식, 파일은 읽지 않음)"""
+    history_path = Path(index['history_path'])
+    for name, item in index['dirs'].items():
+        resource = item['resource']
+        if not resource or not item['entries']:
+            continue
+        file_path = decode_file_uri(resource)
+        if not file_path:
+            continue
+        if path_filter is not None and not path_filter.match_path(file_path):
+            continue
+        history_dir = history_path / name
+        for entry_id, timestamp, source, size, description in item['entries']:
+            if path_filter is not None and not path_filter.match_size(size):
+                continue
+            entry = {'id': entry_id, 'timestamp': timestamp}
+            if source is not None:
+                entry['source'] = source
+            if description is not None:
+                entry['sourceDescription'] = description
+            yield make_record(history_dir, resource, file_path, entry, size)
+
+
+def file_versions(records, file_path):
+    """한 파일의 버전 목록 (오래된 순)
+
+    file_path 는 절대 경로 또는 프로젝트 기준 상대 경로(src/pages/home/page.tsx) 모두 가능합니다.
+    """
+    key = normalize_path(file_path)
+    suffix = '/' + key.lstrip('/')
+    versions = [r for r in records
+                if normalize_path(r['file_path']) == key or normalize_path(r['file_path']).endswith(suffix)]
+    paths = {normalize_path(r['file_path']) for r in versions}
+    if len(paths) > 1:
+        raise ValueError(f"여러 파일과 일치합니다: {', '.join(sorted(paths))}")
+    versions.sort(key=lambda r: (r['timestamp'], str(r['history_file'])))
+    return versions
@@ -0,0 +1,166 @@
+import os
+import sys
+import json
+import errno
+import argparse
+from pathlib import Path
+from datetime import datetime
+
+from .copy_strategies import copy_snapshot
+from .restore import restore_file
+from .scan import PROJECT_PATH
+
+JOURNAL_DIR_NAME = 'cursor-history-journal'
+MANIFEST_NAME = 'manifest.jsonl'
+ROLLED_BACK_MARKER = 'ROLLED_BACK'
+
+# 덮어쓰기 전 파일 보관: 하드링크(메타데이터만) -> reflink -> 복사 순
+SAVE_STRATEGIES = ('hardlink', 'reflink', 'copy_file_range', 'buffered')
+
+
+def default_journal_root(project_path=PROJECT_PATH):
+    """저널 위치: git 저장소면 .git 안, 아니면 프로젝트 루트의 숨김 폴더"""
+    git_dir = Path(project_path) / '.git'
+    if git_dir.is_dir():
+        return git_dir / JOURNAL_DIR_NAME
+    return Path(project_path) / f'.{JOURNAL_DIR_NAME}'
+
+
+class Journal:
+    """복구 저널 하나: 덮어쓰기 전 파일 보관본과 manifest
+
+    save() 는 대상 파일을 보관하고 manifest 를 먼저 기록한 뒤에 반환하므로, 그 다음에 덮어쓰면 됩니다.
+    """
+
+    def __init__(self, project_path=PROJECT_PATH, journal_root=None):
+        journal_root = Path(journal_root or default_journal_root(project_path))
+        self.dir = journal_root / datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        self.files_dir = self.dir / 'files'
+        self.files_dir.mkdir(parents=True)
+        self.manifest = open(self.dir / MANIFEST_NAME, 'a', encoding='utf-8')
+        self.count = 0
+
+    def save(self, target_path, unlink=True):
+        """target_path 의 현재 파일을 보관 (없으면 롤백 때 지울 새 파일로 기록)
+
+        이전 파일은 가능하면 하드링크로 보관하므로, 제자리에 쓰는 복사라면 unlink=True 로 원래 경로를 지워
+        보관본 inode 가 바뀌지 않게 합니다. 임시 파일을 쓰고 os.replace 하는 경우에만 unlink=False 를 씁니다.
+        """
+        entry = {'target': str(target_path), 'saved': None, 'strategy': None}
+        if os.path.lexists(target_path):
+            saved = self.files_dir / f'{self.count:06d}'
+            entry['saved'] = saved.name
+            # 하드링크가 아닌 경우에도 copy_snapshot 이 시간/권한을 같이 옮겨둔다
+            entry['strategy'] = copy_snapshot(target_path, saved, SAVE_STRATEGIES)
+        self.count += 1
+        self.manifest.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self.manifest.flush()
+        os.fsync(self.manifest.fileno())
+        if entry['saved'] and unlink:
+            os.unlink(target_path)
+
+    def close(self):
+        self.manifest.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def restore_journaled(plan, project_path=PROJECT_PATH, journal_root=None, restore=restore_file):
+    """덮어쓰기 전에 이전 파일을 저널에 남기면서 복구하고 저널 디렉토리를 반환
+
+    이전 파일은 가능하면 하드링크로 보관한 뒤 원래 경로를 unlink 하고 새로 쓰므로
+    보관본 inode 는 복구로 바뀌지 않습니다. manifest 는 덮어쓰기 전에 먼저 기록합니다.
+    """
+    restored_count = 0
+    with Journal(project_path, journal_root) as journal:
+        for file_info, target_path in plan:
+            journal.save(target_path)
+            if restore(file_info, target_path):
+                restored_count += 1
+
+    print(f"복구 완료: {restored_count}/{len(plan)} 파일")
+    print(f"저널: {journal.dir}")
+    return journal.dir
+
+
+def list_journals(project_path=PROJECT_PATH, journal_root=None):
+    """저널 목록 (최신순), 각 항목은 (디렉토리, 롤백 여부)"""
+    journal_root = Path(journal_root or default_journal_root(project_path))
+    if not journal_root.exists():
+        return []
+    journals = sorted((d for d in journal_root.iterdir() if (d / MANIFEST_NAME).exists()),
+                      reverse=True)
+    return [(d, (d / ROLLED_BACK_MARKER).exists()) for d in journals]
+
+
+def rollback(journal_dir):
+    """저널을 되돌려 복구 전 상태로 만든다
+
+    보관본을 rename 으로 제자리에 돌려놓으므로 데이터 복사가 없습니다 (같은 파일시스템일 때).
+    복구로 새로 생긴 파일은 삭제합니다.
+    """
+    journal_dir = Path(journal_dir)
+    if (journal_dir / ROLLED_BACK_MARKER).exists():
+        print(f"이미 롤백된 저널입니다: {journal_dir}")
+        return 0
+
+    with open(journal_dir / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+
+    count = 0
+    for entry in reversed(entries):
+        target_path = Path(entry['target'])
+        if entry['saved'] is None:
+            if os.path.lexists(target_path):
+                os.unlink(target_path)
+            count += 1
+            continue
+
+        saved = journal_dir / 'files' / entry['saved']
+        if not saved.exists():
+            print(f"  보관본 없음: {target_path}")
+            continue
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.replace(saved, target_path)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            copy_snapshot(saved, target_path)
+        count += 1
+
+    (journal_dir / ROLLED_BACK_MARKER).write_text(datetime.now().isoformat())
+    print(f"롤백 완료: {count}/{len(entries)} 파일")
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="복구 저널 조회 / 롤백")
+    parser.add_argument('command', choices=['list', 'rollback'])
+    parser.add_argument('journal', nargs='?', help="롤백할 저널 디렉토리 (생략하면 가장 최근 저널)")
+    parser.add_argument('--project', default=str(PROJECT_PATH))
+    args = parser.parse_args(argv)
+
+    journals = list_journals(args.project)
+    if args.command == 'list':
+        for journal_dir, rolled_back in journals:
+            print(f"{journal_dir}{'  (롤백됨)' if rolled_back else ''}")
+        return 0
+
+    if args.journal:
+        rollback(args.journal)
+        return 0
+    pending = [d for d, rolled_back in journals if not rolled_back]
+    if not pending:
+        print("롤백할 저널이 없습니다.")
+        return 1
+    rollback(pending[0])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+import re
+from pathlib import Path, PurePosixPath
+from urllib.parse import quote, unquote
+
+_DRIVE_RE = re.compile(r'^/[A-Za-z]:')
+
+
+def decode_file_uri(uri):
+    """file:// URI를 일반 경로로 변환
+
+    file:///c%3A/x -> c:/x (Windows), file:///tmp/x -> /tmp/x (POSIX, 앞의 / 유지)
+    """
+    if uri.startswith("file:///"):
+        path = unquote(uri[7:])
+        if _DRIVE_RE.match(path):
+            path = path[1:]
+        return Path(path)
+    return None
+
+
+def encode_file_uri(path):
+    """decode_file_uri 의 반대 (Cursor 와 같이 드라이브 문자의 : 도 인코딩)"""
+    path = str(path).replace('\\', '/')
+    if not path.startswith('/'):
+        path = '/' + path
+    return 'file://' + quote(path, safe='/')
+
+
+def normalize_path(path):
+    """비교용 경로 문자열 (슬래시 통일 + 소문자, Windows 경로는 대소문자 구분이 없음)"""
+    return str(path).replace('\\', '/').rstrip('/').lower()
+
+
+class ProjectRouter:
+    """여러 프로젝트 루트 중 경로가 속한 프로젝트 찾기
+
+    루트가 겹치면(예: copydrum_site 와 copydrum_site/supabase/functions) 더 깊은 쪽이 우선입니다.
+    경로의 상위 디렉토리를 하나씩 dict 에서 찾으므로 프로젝트 수와 관계없이 경로 깊이만큼만 비교합니다.
+    """
+
+    def __init__(self, roots):
+        if not isinstance(roots, dict):
+            roots = {Path(r).name: r for r in roots}
+        self.roots = {name: Path(root) for name, root in roots.items()}
+        self._by_key = {normalize_path(root): name for name, root in self.roots.items()}
+
+    def route(self, path):
+        """(프로젝트 이름, 루트 기준 상대 경로) 반환, 어느 프로젝트에도 속하지 않으면 (None, None)"""
+        original = str(path).replace('\\', '/').rstrip('/')
+        key = original.lower()
+        end = len(key)
+        while end > 0:
+            end = key.rfind('/', 0, end)
+            if end <= 0:
+                break
+            name = self._by_key.get(key[:end])
+            if name is not None:
+                return name, PurePosixPath(original[end + 1:])
+        return None, None
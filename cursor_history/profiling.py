@@ -0,0 +1,182 @@
+import sys
+import json
+import time
+import threading
+from collections import Counter
+from pathlib import Path
+
+PROFILE_MODES = ('spans', 'cprofile', 'sample')
+DEFAULT_OUTPUT = 'cursor-history-profile'
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+# 실행 중인 Profiler (없으면 span 은 아무것도 하지 않음)
+_active = None
+
+
+class _Span:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, time.perf_counter() - self.start)
+        return False
+
+
+def span(name):
+    """단계(scan, decode, resolve, group, copy) 시간 측정
+
+    프로파일링이 꺼져 있으면 미리 만들어 둔 빈 객체를 돌려주므로 비용이 거의 없습니다.
+    """
+    if _active is None:
+        return _NULL_SPAN
+    return _Span(_active, name)
+
+
+class _Sampler(threading.Thread):
+    """interval 마다 모든 스레드의 호출 스택을 모으는 샘플러"""
+
+    def __init__(self, interval):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        me = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{Path(code.co_filename).name}:{code.co_name}")
+                    frame = frame.f_back
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class Profiler:
+    """실행 전체를 감싸는 프로파일러
+
+    mode:
+    - spans: 단계별 시간만 (가장 가벼움)
+    - cprofile: cProfile 로 함수별 시간, <output>.prof 로 저장 (pstats/snakeviz 로 열기)
+    - sample: 주기적으로 스택을 수집, <output>.stacks.txt (flamegraph collapsed 형식)
+    모든 모드에서 단계별 시간은 <output>.spans.json 으로 저장하고 요약표를 출력합니다.
+    """
+
+    def __init__(self, mode='spans', output=DEFAULT_OUTPUT, interval=0.005):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"알 수 없는 프로파일 모드: {mode} ({', '.join(PROFILE_MODES)})")
+        self.mode = mode
+        self.output = str(output)
+        self.interval = interval
+        self.totals = {}
+        self.counts = {}
+        self._lock = threading.Lock()
+        self._profile = None
+        self._sampler = None
+
+    def add(self, name, seconds):
+        with self._lock:
+            self.totals[name] = self.totals.get(name, 0.0) + seconds
+            self.counts[name] = self.counts.get(name, 0) + 1
+
+    def __enter__(self):
+        global _active
+        _active = self
+        self.started = time.perf_counter()
+        if self.mode == 'cprofile':
+            import cProfile
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        elif self.mode == 'sample':
+            self._sampler = _Sampler(self.interval)
+            self._sampler.start()
+        return self
+
+    def __exit__(self, *exc):
+        global _active
+        self.elapsed = time.perf_counter() - self.started
+        if self._profile:
+            self._profile.disable()
+        if self._sampler:
+            self._sampler.stop()
+        _active = None
+        self.write()
+        self.print_summary()
+        return False
+
+    def write(self):
+        """원본 프로파일 파일 저장, 저장한 경로 목록 반환"""
+        written = []
+        spans_file = f"{self.output}.spans.json"
+        with open(spans_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                'elapsed': self.elapsed,
+                'stages': {name: {'seconds': self.totals[name], 'count': self.counts[name]}
+                           for name in self.totals},
+            }, f, indent=2)
+        written.append(spans_file)
+        if self._profile:
+            self._profile.dump_stats(f"{self.output}.prof")
+            written.append(f"{self.output}.prof")
+        if self._sampler:
+            with open(f"{self.output}.stacks.txt", 'w', encoding='utf-8') as f:
+                for stack, count in self._sampler.stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+            written.append(f"{self.output}.stacks.txt")
+        self.written = written
+        return written
+
+    def print_summary(self):
+        print("\n" + "=" * 70)
+        print(f"프로파일 ({self.mode}) 전체 {self.elapsed:.3f}초")
+        print("-" * 70)
+        print(f"  {'단계':<12}{'횟수':>10}{'합계(초)':>12}{'평균(ms)':>12}{'비율':>8}")
+        for name, seconds in sorted(self.totals.items(), key=lambda x: x[1], reverse=True):
+            count = self.counts[name]
+            share = seconds / self.elapsed * 100 if self.elapsed else 0
+            print(f"  {name:<12}{count:>10}{seconds:>12.3f}{seconds / count * 1000:>12.3f}{share:>7.1f}%")
+        if self._profile:
+            import pstats
+            print("\n함수별 누적 시간 상위 15개:")
+            pstats.Stats(self._profile).sort_stats('cumulative').print_stats(15)
+        print("저장: " + ", ".join(self.written))
+
+
+def add_profile_arguments(parser):
+    """argparse 에 --profile / --profile-output 추가"""
+    parser.add_argument('--profile', nargs='?', const='spans', choices=PROFILE_MODES,
+                        help="단계별 시간 측정 (spans, cprofile, sample)")
+    parser.add_argument('--profile-output', default=DEFAULT_OUTPUT,
+                        help="프로파일 파일 이름 앞부분 (확장자 제외)")
+
+
+def profiled(args):
+    """--profile 이 있으면 Profiler, 없으면 아무것도 하지 않는 컨텍스트"""
+    if not getattr(args, 'profile', None):
+        return _NULL_SPAN
+    return Profiler(args.profile, args.profile_output)
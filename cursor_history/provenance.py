@@ -0,0 +1,85 @@
+import re
+import argparse
+from functools import lru_cache
+
+# entries.json 의 source/sourceDescription 으로 나눈 편집 종류
+# - save: source 가 없는 일반 저장
+# - undo: 실행 취소/다시 실행
+# - agent: AI/에이전트가 적용한 편집 (chat, composer, agent ...)
+# - workspace: 리팩터링/이름 바꾸기 등 여러 파일을 한 번에 바꾸는 편집 (에이전트 적용일 수도 있음)
+# - other: 그 밖의 source
+PROVENANCES = ('save', 'undo', 'agent', 'workspace', 'other')
+# "사람이 저장한 버전"
+HUMAN_PROVENANCES = frozenset({'save', 'undo'})
+
+_AGENT_RE = re.compile(r'\b(?:chat|composer|agent|ai|copilot|apply|inline|cursor)\b')
+_WORKSPACE_RE = re.compile(r'workspace|refactor|rename|code ?action|format')
+_UNDO_RE = re.compile(r'undo|redo')
+
+
+@lru_cache(maxsize=4096)
+def classify_source(source, description=None):
+    """source/sourceDescription 을 PROVENANCES 중 하나로"""
+    if not source and not description:
+        return 'save'
+    text = ' '.join(t for t in (source, description) if t).lower()
+    text = re.sub(r'[._\-/]', ' ', text)
+    if _UNDO_RE.search(text):
+        return 'undo'
+    if _AGENT_RE.search(text):
+        return 'agent'
+    if _WORKSPACE_RE.search(text):
+        return 'workspace'
+    return 'other'
+
+
+def parse_provenances(values):
+    """명령줄 값 목록(쉼표 구분 가능, 'human' 은 save+undo)을 집합으로, 없으면 None"""
+    if not values:
+        return None
+    result = set()
+    for value in values:
+        for name in value.split(','):
+            name = name.strip().lower()
+            if name == 'human':
+                result |= HUMAN_PROVENANCES
+            elif name in PROVENANCES:
+                result.add(name)
+            else:
+                raise ValueError(f"알 수 없는 편집 종류: {name} ({', '.join(PROVENANCES)}, human)")
+    return frozenset(result)
+
+
+def provenance_matcher(include=None, exclude=None):
+    """편집 종류 조건 함수, 조건이 없으면 None"""
+    if not include and not exclude:
+        return None
+
+    def match(provenance):
+        if include and provenance not in include:
+            return False
+        return not (exclude and provenance in exclude)
+    return match
+
+
+def source_kinds(value):
+    """argparse type: 'agent,workspace' -> frozenset"""
+    try:
+        return parse_provenances([value])
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def add_provenance_arguments(parser):
+    """argparse 에 --source / --exclude-source 추가 (여러 번 지정 가능)"""
+    parser.add_argument('--source', type=source_kinds, action='append',
+                        help=f"이 편집 종류의 버전만 ({', '.join(PROVENANCES)}, human=save+undo)")
+    parser.add_argument('--exclude-source', type=source_kinds, action='append',
+                        help="이 편집 종류의 버전은 제외 (예: agent)")
+
+
+def provenance_from_args(args):
+    """--source/--exclude-source 로 조건 함수 만들기"""
+    include = frozenset().union(*args.source) if args.source else None
+    exclude = frozenset().union(*args.exclude_source) if args.exclude_source else None
+    return provenance_matcher(include, exclude)
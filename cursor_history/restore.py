@@ -0,0 +1,194 @@
+import os
+import sys
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+from .checkpoint import Checkpoint, checkpointed_restore, resume_plan, scan_history_checkpointed
+from .copy_strategies import DEFAULT_STRATEGIES, copy_snapshot
+from .filters import compile_filter
+from .paths import ProjectRouter
+from .profiling import add_profile_arguments, profiled, span
+from .provenance import add_provenance_arguments, provenance_from_args
+from .scan import HISTORY_PATH, PROJECT_PATH, scan_history
+from .workspaces import split_by_project
+
+
+def plan_restore(records, project_path=PROJECT_PATH, before=None, after=None, match=None):
+    """파일별로 복구할 버전을 골라 [(레코드, 대상 경로)] 목록 반환
+
+    after <= 시간 < before (datetime) 범위 안에서 가장 최신 버전을 고릅니다.
+    match(편집 종류) 를 주면 조건에 맞는 버전 중에서 고릅니다 (예: 에이전트 편집 제외).
+    프로젝트 밖의 파일은 건너뜁니다 (기존 스크립트처럼 파일명만으로 src 에 넣지 않음).
+    """
+    router = ProjectRouter({'project': project_path})
+    with span('group'):
+        latest = {}
+        for record in records:
+            if before is not None and record['timestamp'] >= before:
+                continue
+            if after is not None and record['timestamp'] < after:
+                continue
+            if match is not None and not match(record['provenance']):
+                continue
+            key = str(record['file_path']).lower()
+            if key not in latest or record['timestamp'] > latest[key]['timestamp']:
+                latest[key] = record
+
+    with span('resolve'):
+        plan = []
+        for record in latest.values():
+            _, relative_path = router.route(record['file_path'])
+            if relative_path is None:
+                continue
+            plan.append((record, project_path / relative_path))
+        plan.sort(key=lambda x: str(x[1]))
+        return plan
+
+
+def restore_file(file_info, target_path, strategies=DEFAULT_STRATEGIES):
+    """히스토리 파일을 대상 경로로 복구
+
+    사용한 복사 방식은 file_info['copy_strategy'] 에 기록됩니다.
+    """
+    try:
+        with span('copy'):
+            target_path.parent.mkdir(parents=True, exist_ok=True)
+            file_info['copy_strategy'] = copy_snapshot(file_info['history_file'], target_path, strategies)
+            if file_info['copy_strategy'] != 'hardlink':
+                # 하드링크는 히스토리 원본과 inode 를 공유하므로 시간을 바꾸지 않는다
+                timestamp = file_info['timestamp'].timestamp()
+                os.utime(target_path, (timestamp, timestamp))
+        return True
+    except Exception as e:
+        print(f"  오류: {e}")
+        return False
+
+
+def count_strategies(plan):
+    """복구 계획에서 방식별 파일 수"""
+    counts = {}
+    for file_info, _ in plan:
+        name = file_info.get('copy_strategy')
+        if name:
+            counts[name] = counts.get(name, 0) + 1
+    return counts
+
+
+def restore_project(plan, project_path, restore, checkpoint, check_conflicts=False, journal=False):
+    """프로젝트 하나의 복구 계획 실행 (--check-conflicts / --journal 에 따라)"""
+    if check_conflicts:
+        from .conflicts import restore_with_conflicts
+        if journal:
+            from .journal import Journal
+            with Journal(project_path) as opened:
+                restore_with_conflicts(plan, project_path, restore, mark_done=checkpoint.mark_restored,
+                                       journal=opened)
+            print(f"저널: {opened.dir}")
+        else:
+            restore_with_conflicts(plan, project_path, restore, mark_done=checkpoint.mark_restored)
+    elif journal:
+        from .journal import restore_journaled
+        restore_journaled(plan, project_path, restore=restore)
+    else:
+        restored = sum(restore(file_info, target_path) for file_info, target_path in plan)
+        print(f"복구 완료: {restored}/{len(plan)} 파일")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="히스토리에서 프로젝트 파일 복구")
+    parser.add_argument('--project', action='append',
+                        help="프로젝트 루트 (여러 번 지정하면 히스토리를 한 번만 읽어 프로젝트별로 복구)")
+    parser.add_argument('--history', default=str(HISTORY_PATH))
+    parser.add_argument('--before', type=datetime.fromisoformat, help="이 시간 이전의 최신 버전 (예: 2025-11-10T01:00)")
+    parser.add_argument('--after', type=datetime.fromisoformat, help="이 시간부터의 버전만 (이 시간 포함)")
+    parser.add_argument('--ext', action='append', help="확장자 (여러 번 지정 가능)")
+    parser.add_argument('--glob', action='append', help="파일 glob (여러 번 지정 가능)")
+    parser.add_argument('--exclude', action='append', help="제외할 파일 glob (여러 번 지정 가능)")
+    parser.add_argument('--keyword', action='append', help="경로에 포함될 단어 (여러 번 지정 시 하나라도 포함)")
+    parser.add_argument('--concurrency', type=int, help="여러 디렉토리 동시 스캔 (네트워크 공유 폴더용)")
+    parser.add_argument('--journal', action='store_true', help="덮어쓰기 전 파일을 저널에 남김 (rollback 가능)")
+    parser.add_argument('--check-conflicts', action='store_true', help="git HEAD 와 비교해서 로컬 수정은 덮어쓰지 않음")
+    parser.add_argument('--dry-run', action='store_true', help="복구할 파일 목록만 출력")
+    parser.add_argument('--restart', action='store_true', help="중단된 실행의 진행 상태를 버리고 처음부터")
+    parser.add_argument('--validate', action='store_true',
+                        help="빈 파일/깨진 JSON/괄호가 안 맞는 스냅샷은 건너뛰고 그 이전 버전으로")
+    add_provenance_arguments(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    project_paths = [Path(p) for p in args.project or [PROJECT_PATH]]
+    history_path = Path(args.history)
+    # 같은 조건으로 다시 실행하면 중단된 곳부터 이어서 (--concurrency 스캔은 처음부터)
+    checkpoint = None
+    if not args.dry_run:
+        params = {name: getattr(args, name) for name in
+                  ('history', 'project', 'before', 'after', 'ext', 'glob', 'exclude', 'keyword', 'validate')}
+        params.update({name: sorted(set().union(*getattr(args, name))) for name in ('source', 'exclude_source')
+                       if getattr(args, name)})
+        checkpoint = Checkpoint(params)
+        if args.restart:
+            checkpoint.clear()
+
+    with profiled(args):
+        path_filter = compile_filter(extensions=args.ext, globs=args.glob, prefixes=project_paths,
+                                     keywords=args.keyword, exclude_globs=args.exclude)
+        try:
+            if args.concurrency:
+                from .async_scan import scan_history_concurrent
+                records = scan_history_concurrent(history_path, path_filter, args.concurrency)
+            elif checkpoint:
+                records = scan_history_checkpointed(history_path, path_filter, checkpoint)
+            else:
+                records = scan_history(history_path, path_filter)
+        except KeyboardInterrupt:
+            return 130
+        # 루트가 겹치면 더 깊은 프로젝트에만 넣으므로 같은 파일을 두 번 복구하지 않는다
+        projects = split_by_project(records, ProjectRouter({str(p): p for p in project_paths}))
+        plans = {}
+        for project_path in project_paths:
+            project_records = projects[str(project_path)]
+            if args.validate:
+                from .validate import plan_restore_validated
+                plan, skipped, unusable = plan_restore_validated(project_records, project_path, args.before,
+                                                                 args.after, provenance_from_args(args))
+                for history_file, problem in sorted(skipped.items()):
+                    print(f"  [건너뜀] {history_file}: {problem}")
+                for target_path in unusable:
+                    print(f"  [주의] 쓸 만한 버전이 없어 가장 최신 버전 사용: {target_path}")
+            else:
+                plan = plan_restore(project_records, project_path, args.before, args.after,
+                                    provenance_from_args(args))
+            plans[project_path] = plan
+        total = sum(len(plan) for plan in plans.values())
+        print(f"버전 {len(records)}개 중 복구할 파일 {total}개")
+
+        if args.dry_run:
+            for project_path, plan in plans.items():
+                if len(plans) > 1:
+                    print(f"\n[{project_path}] {len(plan)}개")
+                for file_info, target_path in plan:
+                    print(f"  {file_info['timestamp'].strftime('%Y-%m-%d %H:%M:%S')}  {file_info['provenance']:<9}  "
+                          f"{target_path}")
+            return 0
+
+        restore = checkpointed_restore(restore_file, checkpoint)
+        try:
+            for project_path, plan in plans.items():
+                if len(plans) > 1:
+                    print(f"\n[{project_path}]")
+                plans[project_path] = plan = resume_plan(plan, checkpoint)
+                restore_project(plan, project_path, restore, checkpoint, args.check_conflicts, args.journal)
+        except KeyboardInterrupt:
+            checkpoint.close()
+            print("\n복구 중단: 같은 명령으로 다시 실행하면 남은 파일부터 복구합니다.")
+            return 130
+        checkpoint.clear()
+        counts = count_strategies([item for plan in plans.values() for item in plan])
+        if counts:
+            print("복사 방식: " + ", ".join(f"{name} {count}개" for name, count in counts.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+import os
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from datetime import datetime
+
+from .filters import compile_filter
+from .paths import decode_file_uri
+from .provenance import classify_source
+from .profiling import span
+from .throttle import add_throttle_arguments, throttle_from_args
+
+# 설정
+PROJECT_PATH = Path(r"C:\copydrum_site")
+HISTORY_PATH = Path(os.path.expanduser(r"~\AppData\Roaming\Cursor\User\History"))
+PROJECT_KEYWORD = 'copydrum'
+# 기존 스크립트의 'copydrum' in str(file_path).lower() 와 같은 조건
+DEFAULT_FILTER = compile_filter(keywords=[PROJECT_KEYWORD])
+
+
+def list_history_dirs(history_path=HISTORY_PATH):
+    """히스토리 루트 아래의 디렉토리 목록"""
+    with os.scandir(history_path) as it:
+        return sorted(Path(e.path) for e in it if e.is_dir())
+
+
+def make_record(history_dir, resource, file_path, entry, size):
+    """버전(entry) 하나의 레코드"""
+    entry_id = entry.get('id', '')
+    return {
+        'history_dir': history_dir,
+        'resource': resource,
+        'file_path': file_path,
+        'history_file': history_dir / entry_id,
+        'entry_id': entry_id,
+        'timestamp': datetime.fromtimestamp(entry.get('timestamp', 0) / 1000),
+        'source': entry.get('source'),
+        'provenance': classify_source(entry.get('source'), entry.get('sourceDescription')),
+        'size': size,
+        'entry': entry,
+    }
+
+
+def scan_history_dir(history_dir, path_filter=DEFAULT_FILTER):
+    """히스토리 디렉토리 하나를 읽어 버전(entry)별 레코드 목록 반환
+
+    entries.json 을 먼저 읽고 resource 경로가 path_filter 에 맞지 않으면 바로 버립니다.
+    맞는 경우에만 디렉토리 목록을 한 번 읽어, 실제로 있는 스냅샷(entry id 와 같은 이름)만 레코드로 만듭니다.
+    """
+    with span('decode'):
+        try:
+            with open(os.path.join(history_dir, 'entries.json'), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return []
+
+        if not isinstance(data, dict) or not isinstance(data.get('resource'), str):
+            return []
+        file_path = decode_file_uri(data['resource'])
+    if not file_path:
+        return []
+
+    with span('resolve'):
+        if path_filter is not None and not path_filter.match_path(file_path):
+            return []
+        entries = data.get('entries')
+        if not isinstance(entries, list) or not entries:
+            return []
+
+        try:
+            with os.scandir(history_dir) as it:
+                sizes = {e.name: e.stat().st_size for e in it if e.is_file()}
+        except OSError:
+            return []
+
+        history_dir = Path(history_dir)
+        records = []
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            entry_id = entry.get('id', '')
+            if entry_id not in sizes or entry_id == 'entries.json':
+                continue
+            if path_filter is not None and not path_filter.match_size(sizes[entry_id]):
+                continue
+            records.append(make_record(history_dir, data['resource'], file_path, entry, sizes[entry_id]))
+        return records
+
+
+def sort_records(records):
+    """타임스탬프 최신순 정렬 (같은 시간이면 경로순으로 고정)"""
+    records.sort(key=lambda x: (x['timestamp'], str(x['history_file'])), reverse=True)
+    return records
+
+
+def scan_history(history_path=HISTORY_PATH, path_filter=DEFAULT_FILTER, throttle=None):
+    """히스토리 전체를 순서대로 스캔
+
+    throttle(throttle.Throttle)을 주면 디렉토리마다 한도를 지키고 걸린 시간을 알려줍니다.
+    """
+    if not history_path.exists():
+        print(f"히스토리 경로를 찾을 수 없습니다: {history_path}")
+        return []
+
+    with span('scan'):
+        history_dirs = list_history_dirs(history_path)
+    print(f"총 {len(history_dirs)}개 히스토리 디렉토리 스캔 중...")
+
+    records = []
+    for history_dir in history_dirs:
+        if throttle:
+            records.extend(scan_history_dir_throttled(history_dir, path_filter, throttle))
+        else:
+            records.extend(scan_history_dir(history_dir, path_filter))
+    with span('group'):
+        return sort_records(records)
+
+
+def scan_history_dir_throttled(history_dir, path_filter, throttle):
+    """throttle 한도(작업 2개 + entries.json 크기)를 지키면서 scan_history_dir, 걸린 시간은 throttle 에 기록"""
+    try:
+        nbytes = os.stat(os.path.join(history_dir, 'entries.json')).st_size
+    except OSError:
+        nbytes = 0
+    # entries.json 읽기 + 디렉토리 목록 읽기
+    throttle.wait(2, nbytes)
+    started = time.monotonic()
+    records = scan_history_dir(history_dir, path_filter)
+    throttle.record(time.monotonic() - started)
+    return records
+
+
+def group_by_file(records):
+    """파일 경로별로 버전 묶기 (각 목록은 최신순)"""
+    with span('group'):
+        file_groups = {}
+        for record in records:
+            file_groups.setdefault(str(record['file_path']), []).append(record)
+        return file_groups
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="히스토리에 있는 파일과 버전 수 보기")
+    parser.add_argument('--history', default=str(HISTORY_PATH))
+    parser.add_argument('--all', action='store_true', help="copydrum 외 다른 프로젝트 파일도 포함")
+    parser.add_argument('--project', action='append',
+                        help="이 프로젝트 루트 아래 파일만, 프로젝트별로 보기 (여러 번 지정 가능, 히스토리는 한 번만 읽음)")
+    parser.add_argument('--ext', action='append', help="확장자 (여러 번 지정 가능)")
+    parser.add_argument('--glob', action='append', help="파일 glob (여러 번 지정 가능)")
+    parser.add_argument('--concurrency', type=int, help="여러 디렉토리 동시 스캔 (네트워크 공유 폴더용)")
+    add_throttle_arguments(parser)
+    args = parser.parse_args(argv)
+
+    project_paths = [Path(p) for p in args.project or []]
+    path_filter = compile_filter(extensions=args.ext, globs=args.glob, prefixes=project_paths or None,
+                                 keywords=None if args.all or project_paths else [PROJECT_KEYWORD])
+    throttle = throttle_from_args(args)
+    if args.concurrency:
+        from .async_scan import scan_history_concurrent
+        records = scan_history_concurrent(Path(args.history), path_filter, args.concurrency, throttle)
+    else:
+        records = scan_history(Path(args.history), path_filter, throttle)
+
+    if project_paths:
+        from .paths import ProjectRouter
+        from .workspaces import split_by_project
+        projects = split_by_project(records, ProjectRouter({str(p): p for p in project_paths}))
+    else:
+        projects = {None: records}
+
+    file_count = 0
+    for project, project_records in projects.items():
+        file_groups = group_by_file(project_records)
+        file_count += len(file_groups)
+        if project is not None:
+            print(f"\n[{project}] 파일 {len(file_groups)}개, 버전 {len(project_records)}개")
+        for file_key, versions in sorted(file_groups.items(), key=lambda x: x[1][0]['timestamp'], reverse=True):
+            latest = versions[0]['timestamp'].strftime('%Y-%m-%d %H:%M:%S')
+            shown = versions[0]['relative_path'] if project is not None else file_key
+            print(f"  {latest}  {len(versions):>4}개  {shown}")
+    print(f"\n파일 {file_count}개, 버전 {sum(len(r) for r in projects.values())}개")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
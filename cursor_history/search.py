@@ -0,0 +1,224 @@
+import sys
+import hashlib
+import sqlite3
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+from .filters import compile_filter
+from .index import INDEX_PATH, iter_records, update_index
+from .scan import DEFAULT_FILTER, HISTORY_PATH
+from .snapshot import open_snapshot, search_snapshot
+
+SEARCH_DB_PATH = Path.home() / '.cursor_history' / 'search.db'
+# 이보다 큰 스냅샷은 색인하지 않음 (번들 파일 등)
+MAX_INDEX_BYTES = 8 * 1024 * 1024
+# 더 이상 쓰지 않는 색인 텍스트가 살아 있는 것의 이 비율을 넘으면 전문 색인을 다시 만듦
+REBUILD_RATIO = 0.25
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    docid INTEGER PRIMARY KEY,
+    digest TEXT UNIQUE NOT NULL,
+    indexed INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS versions (
+    history_file TEXT PRIMARY KEY,
+    file_path TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    digest TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS versions_digest ON versions (digest);
+CREATE VIRTUAL TABLE IF NOT EXISTS blob_text USING fts5 (text, tokenize='trigram', content='');
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def open_search_db(db_path=SEARCH_DB_PATH):
+    """검색 DB 열기 (SQLite FTS5 trigram 색인)"""
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(str(db_path))
+    db.executescript(SCHEMA)
+    return db
+
+
+def _text_of(view, max_bytes):
+    if len(view) > max_bytes or b'\0' in view[:8192].tobytes():
+        return None
+    return str(view, 'utf-8', 'replace')
+
+
+def _read_text(history_file, max_bytes=MAX_INDEX_BYTES):
+    """색인할 텍스트, 바이너리이거나 너무 크면 None"""
+    with open_snapshot(history_file) as view:
+        return _text_of(view, max_bytes)
+
+
+def _read_snapshot(history_file, max_bytes=MAX_INDEX_BYTES):
+    """한 번 열어서 (내용 해시(sha256), 색인할 텍스트 또는 None)"""
+    h = hashlib.sha256()
+    with open_snapshot(history_file) as view:
+        for start in range(0, len(view), 1024 * 1024):
+            h.update(view[start:start + 1024 * 1024])
+        return h.hexdigest(), _text_of(view, max_bytes)
+
+
+def _meta(db, key):
+    row = db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else 0
+
+
+def rebuild_text_index(db, max_bytes=MAX_INDEX_BYTES):
+    """전문 색인을 살아 있는 내용만으로 다시 만들기 (내용마다 스냅샷 하나를 다시 읽음)
+
+    content='' 색인은 원래 텍스트 없이 행을 지울 수 없으므로 지워진 내용은 이렇게 정리합니다.
+    """
+    db.execute("INSERT INTO blob_text (blob_text) VALUES ('delete-all')")
+    rows = db.execute("""
+        SELECT b.docid, MIN(v.history_file) FROM blobs b JOIN versions v ON v.digest = b.digest
+        WHERE b.indexed GROUP BY b.docid
+    """).fetchall()
+    for docid, history_file in rows:
+        try:
+            text = _read_text(history_file, max_bytes)
+        except OSError:
+            text = None
+        if text is None:
+            db.execute("UPDATE blobs SET indexed = 0 WHERE docid = ?", (docid,))
+        else:
+            db.execute("INSERT INTO blob_text (rowid, text) VALUES (?, ?)", (docid, text))
+    db.execute("INSERT OR REPLACE INTO meta VALUES ('stale_text', 0)")
+    db.commit()
+
+
+def update_search_index(db, records, max_bytes=MAX_INDEX_BYTES):
+    """새로 생긴 버전만 색인에 추가, (새 버전 수, 새 내용 수, 삭제된 버전 수) 반환
+
+    버전은 내용 해시로 묶으므로 같은 내용이 여러 번 저장되어 있어도 한 번만 색인합니다.
+    이미 색인된 버전(스냅샷 경로)은 다시 읽지 않고, 새 스냅샷은 한 번만 읽어 해시와 텍스트를 얻습니다.
+    사라진 버전을 지운 뒤 어느 버전도 쓰지 않는 내용(blobs)도 지우고,
+    그렇게 쌓인 색인 텍스트가 많아지면 전문 색인을 다시 만듭니다.
+    """
+    known = {row[0] for row in db.execute("SELECT history_file FROM versions")}
+    known_digests = {row[0] for row in db.execute("SELECT digest FROM blobs")}
+    seen = set()
+    new_versions = new_blobs = 0
+
+    for record in records:
+        key = str(record['history_file'])
+        seen.add(key)
+        if key in known:
+            continue
+        try:
+            digest, text = _read_snapshot(record['history_file'], max_bytes)
+            if digest not in known_digests:
+                cur = db.execute("INSERT INTO blobs (digest, indexed) VALUES (?, ?)",
+                                 (digest, text is not None))
+                if text is not None:
+                    db.execute("INSERT INTO blob_text (rowid, text) VALUES (?, ?)", (cur.lastrowid, text))
+                known_digests.add(digest)
+                new_blobs += 1
+        except OSError:
+            continue
+        db.execute("INSERT INTO versions VALUES (?, ?, ?, ?)", (
+            key, str(record['file_path']), record['entry'].get('timestamp', 0), digest,
+        ))
+        new_versions += 1
+        if new_versions % 500 == 0:
+            db.commit()
+
+    removed = known - seen
+    db.executemany("DELETE FROM versions WHERE history_file = ?", ((k,) for k in removed))
+    if removed:
+        orphaned = "FROM blobs WHERE digest NOT IN (SELECT digest FROM versions)"
+        stale = db.execute(f"SELECT COUNT(*) {orphaned} AND indexed").fetchone()[0]
+        db.execute(f"DELETE {orphaned}")
+        db.execute("INSERT OR REPLACE INTO meta VALUES ('stale_text', ?)", (_meta(db, 'stale_text') + stale,))
+    db.commit()
+    live = db.execute("SELECT COUNT(*) FROM blobs WHERE indexed").fetchone()[0]
+    if _meta(db, 'stale_text') > REBUILD_RATIO * live:
+        rebuild_text_index(db, max_bytes)
+    return new_versions, new_blobs, len(removed)
+
+
+def search(db, text, path_filter=None, verify=False):
+    """text 가 들어있는 버전 목록 (파일별로 묶어 최신순)
+
+    trigram 색인은 대소문자를 구분하지 않는 부분 문자열 검색입니다.
+    verify=True 면 후보 스냅샷을 실제로 열어 대소문자까지 일치하는지 확인합니다.
+    반환값: {파일 경로: [(시간, 스냅샷 경로), ...]}
+    """
+    if len(text) < 3:
+        raise ValueError("검색어는 3글자 이상이어야 합니다 (trigram 색인)")
+    phrase = '"' + text.replace('"', '""') + '"'
+    rows = db.execute("""
+        SELECT v.file_path, v.timestamp, v.history_file
+        FROM blob_text
+        JOIN blobs b ON b.docid = blob_text.rowid
+        JOIN versions v ON v.digest = b.digest
+        WHERE blob_text MATCH ?
+        ORDER BY v.timestamp DESC
+    """, (phrase,))
+
+    results = {}
+    verified = {}
+    for file_path, timestamp, history_file in rows:
+        if path_filter is not None and not path_filter.match_path(file_path):
+            continue
+        if verify:
+            if history_file not in verified:
+                try:
+                    verified[history_file] = search_snapshot(history_file, text) >= 0
+                except OSError:
+                    verified[history_file] = False
+            if not verified[history_file]:
+                continue
+        results.setdefault(file_path, []).append(
+            (datetime.fromtimestamp(timestamp / 1000), Path(history_file))
+        )
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="모든 히스토리 버전에서 문자열 검색")
+    parser.add_argument('text')
+    parser.add_argument('--history', default=str(HISTORY_PATH))
+    parser.add_argument('--index', default=str(INDEX_PATH))
+    parser.add_argument('--db', default=str(SEARCH_DB_PATH))
+    parser.add_argument('--glob', action='append', help="검색할 파일 glob (여러 번 지정 가능)")
+    parser.add_argument('--exact', action='store_true', help="대소문자까지 정확히 일치하는 버전만")
+    parser.add_argument('--no-update', action='store_true', help="색인 갱신 없이 검색")
+    args = parser.parse_args(argv)
+
+    db = open_search_db(args.db)
+    if not args.no_update:
+        index = update_index(Path(args.history), Path(args.index))
+        new_versions, new_blobs, removed = update_search_index(db, iter_records(index, DEFAULT_FILTER))
+        print(f"검색 색인 갱신: 새 버전 {new_versions}, 새 내용 {new_blobs}, 삭제 {removed}")
+
+    path_filter = compile_filter(globs=args.glob) if args.glob else None
+    try:
+        results = search(db, args.text, path_filter, args.exact)
+    except ValueError as e:
+        print(f"[오류] {e}")
+        return 1
+
+    if not results:
+        print(f"\n'{args.text}' 를 포함한 버전이 없습니다.")
+        return 1
+    print(f"\n'{args.text}' 검색 결과: {len(results)}개 파일")
+    print("-" * 70)
+    for file_path, versions in sorted(results.items(), key=lambda x: x[1][0][0], reverse=True):
+        print(f"\n[파일] {file_path}")
+        print(f"   버전 {len(versions)}개: {versions[-1][0].strftime('%Y-%m-%d %H:%M:%S')} ~ "
+              f"{versions[0][0].strftime('%Y-%m-%d %H:%M:%S')}")
+        for timestamp, history_file in versions[:5]:
+            print(f"   {timestamp.strftime('%Y-%m-%d %H:%M:%S')}  {history_file}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
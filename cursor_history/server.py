@@ -0,0 +1,314 @@
+import os
+import sys
+import json
+import socket
+import argparse
+import threading
+import socketserver
+from bisect import bisect_left
+from datetime import datetime
+from pathlib import Path
+
+from .client import SOCKET_PATH
+from .filters import compile_filter
+from .index import INDEX_PATH, iter_records, load_index, refresh_index, save_index
+from .paths import ProjectRouter, decode_file_uri, normalize_path
+from .provenance import classify_source, parse_provenances, provenance_matcher
+from .scan import HISTORY_PATH, PROJECT_PATH
+from .throttle import add_throttle_arguments, throttle_from_args
+
+# 이 간격(초)마다 바뀐 히스토리 디렉토리만 다시 읽음
+REFRESH_INTERVAL = 2.0
+
+
+def _ms(value):
+    """ISO 시간 문자열(또는 None)을 ms 로"""
+    if value is None:
+        return None
+    return int(datetime.fromisoformat(value).timestamp() * 1000)
+
+
+class HistoryTable:
+    """인덱스를 파일별 버전 목록으로 펼쳐 메모리에 유지
+
+    files: {정규화 경로: [file_path, [timestamp(ms)], [(timestamp, 디렉토리 이름, entry id, source, 크기, 편집 종류)]]}
+    버전 목록은 오래된 순이라 '시간 T 이전 최신 버전'은 이진 탐색 한 번입니다.
+    편집 종류 조건(match)이 있으면 그 위치에서 조건에 맞는 버전까지 거슬러 올라갑니다.
+    """
+
+    def __init__(self, index):
+        self.index = index
+        self.history_path = Path(index['history_path'])
+        self.files = {}
+        self.dir_keys = {}
+        self.key_dirs = {}
+        self.by_name = {}
+        self.rebuild(index['dirs'])
+
+    def rebuild(self, names):
+        """디렉토리 이름들이 바뀌었을 때 관련 파일만 다시 만들기"""
+        affected = set()
+        for name in names:
+            old_key = self.dir_keys.pop(name, None)
+            if old_key is not None:
+                self.key_dirs[old_key].discard(name)
+                affected.add(old_key)
+            item = self.index['dirs'].get(name)
+            if not item or not item['resource'] or not item['entries']:
+                continue
+            file_path = decode_file_uri(item['resource'])
+            if not file_path:
+                continue
+            key = normalize_path(file_path)
+            self.dir_keys[name] = key
+            self.key_dirs.setdefault(key, set()).add(name)
+            affected.add(key)
+
+        for key in affected:
+            dir_names = self.key_dirs.get(key)
+            if not dir_names:
+                self.key_dirs.pop(key, None)
+                if self.files.pop(key, None) is not None:
+                    self.by_name[key.rsplit('/', 1)[-1]].discard(key)
+                continue
+            versions = []
+            for name in dir_names:
+                for entry_id, timestamp, source, size, description in self.index['dirs'][name]['entries']:
+                    versions.append((timestamp, name, entry_id, source, size, classify_source(source, description)))
+            versions.sort()
+            file_path = decode_file_uri(self.index['dirs'][next(iter(dir_names))]['resource'])
+            self.files[key] = [file_path, [v[0] for v in versions], versions]
+            self.by_name.setdefault(key.rsplit('/', 1)[-1], set()).add(key)
+
+    def find(self, file_path):
+        """절대 경로 또는 상대 경로(src/pages/home/page.tsx)에 해당하는 정규화 경로 (index.file_versions 와 같은 규칙)"""
+        key = normalize_path(file_path)
+        if key in self.files:
+            return key
+        suffix = '/' + key.lstrip('/')
+        matches = [k for k in self.by_name.get(key.rsplit('/', 1)[-1], ()) if k.endswith(suffix)]
+        if len(matches) > 1:
+            raise ValueError(f"여러 파일과 일치합니다: {', '.join(sorted(matches))}")
+        return matches[0] if matches else None
+
+    def version(self, key, position):
+        file_path, _, versions = self.files[key]
+        timestamp, name, entry_id, source, size, provenance = versions[position]
+        return {
+            'file_path': str(file_path),
+            'history_file': str(self.history_path / name / entry_id),
+            'entry_id': entry_id,
+            'timestamp': datetime.fromtimestamp(timestamp / 1000).isoformat(),
+            'source': source,
+            'provenance': provenance,
+            'size': size,
+        }
+
+    def _position(self, key, before_ms, after_ms, match):
+        """조건에 맞는 가장 최신 버전 위치, 없으면 None"""
+        _, timestamps, versions = self.files[key]
+        end = bisect_left(timestamps, before_ms) if before_ms is not None else len(timestamps)
+        start = bisect_left(timestamps, after_ms) if after_ms is not None else 0
+        for position in range(end - 1, start - 1, -1):
+            if match is None or match(versions[position][5]):
+                return position
+        return None
+
+    def latest(self, file_path, before_ms=None, after_ms=None, match=None):
+        """after <= 시간 < before 인 가장 최신 버전, 없으면 None (plan_restore 와 같은 범위)"""
+        key = self.find(file_path)
+        if key is None:
+            return None
+        position = self._position(key, before_ms, after_ms, match)
+        return None if position is None else self.version(key, position)
+
+    def plan(self, project_path, before_ms=None, after_ms=None, path_filter=None, match=None):
+        """restore.plan_restore 와 같은 계획을 파일별 이진 탐색으로 계산"""
+        project_path = Path(project_path)
+        router = ProjectRouter({'project': project_path})
+        prefix = normalize_path(project_path) + '/'
+        plan = []
+        for key, (file_path, _, _) in self.files.items():
+            if not key.startswith(prefix):
+                continue
+            if path_filter is not None and not path_filter.match_path(file_path):
+                continue
+            position = self._position(key, before_ms, after_ms, match)
+            if position is None:
+                continue
+            _, relative_path = router.route(file_path)
+            if relative_path is None:
+                continue
+            version = self.version(key, position)
+            version['target'] = str(project_path / relative_path)
+            plan.append(version)
+        plan.sort(key=lambda x: x['target'])
+        return plan
+
+
+class IndexServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """인덱스를 메모리에 두고 한 줄짜리 JSON 요청에 답하는 서버
+
+    요청: {"op": "latest" | "plan" | "export" | "stats" | "refresh" | "shutdown", ...}
+    latest/plan 은 "source"/"exclude_source" (편집 종류 목록) 로 버전을 거를 수 있습니다.
+    응답: {"ok": true, "result": ...} 또는 {"ok": false, "error": "..."}
+    """
+    daemon_threads = True
+
+    def __init__(self, socket_path, history_path=HISTORY_PATH, index_path=INDEX_PATH,
+                 refresh_interval=REFRESH_INTERVAL, throttle=None):
+        self.history_path = Path(history_path)
+        self.index_path = Path(index_path)
+        self.refresh_interval = refresh_interval
+        self.throttle = throttle
+        # lock: 메모리 테이블/인덱스 교체와 질의, refresh_lock: 갱신끼리 겹치지 않게
+        self.lock = threading.Lock()
+        self.refresh_lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.index = load_index(self.index_path, self.history_path)
+        refresh_index(self.index, self.history_path, throttle)
+        save_index(self.index, self.index_path)
+        self.table = HistoryTable(self.index)
+
+        socket_path = Path(socket_path)
+        socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if socket_path.exists():
+            # 이전 서버가 남긴 소켓 파일 (살아 있는 서버면 연결이 되므로 지우지 않음)
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(str(socket_path))
+                raise OSError(f"이미 실행 중인 서버가 있습니다: {socket_path}")
+            except (ConnectionRefusedError, FileNotFoundError):
+                socket_path.unlink()
+            finally:
+                probe.close()
+        super().__init__(str(socket_path), IndexRequestHandler)
+        os.chmod(socket_path, 0o600)
+
+    def refresh(self):
+        """바뀐 디렉토리만 인덱스와 메모리 테이블에 반영, 바뀐 디렉토리 수 반환
+
+        디렉토리 스캔(throttle 대기 포함)과 저장은 인덱스 복사본으로 lock 없이 하고,
+        질의를 막는 것은 테이블 갱신과 인덱스 교체뿐입니다.
+        """
+        with self.refresh_lock:
+            with self.lock:
+                before = self.index['dirs']
+                index = dict(self.index, dirs=dict(before))
+            # refresh_index 는 바뀐 디렉토리의 항목을 새 객체로 바꾸므로 before 의 항목은 그대로다
+            refresh_index(index, self.history_path, self.throttle)
+            after = index['dirs']
+            changed = [name for name in before.keys() | after.keys() if before.get(name) is not after.get(name)]
+            if not changed:
+                return 0
+            with self.lock:
+                self.index = index
+                self.table.index = index
+                self.table.rebuild(changed)
+            save_index(index, self.index_path)
+            return len(changed)
+
+    def refresh_loop(self):
+        while not self.stopped.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except OSError as e:
+                print(f"  갱신 오류: {e}")
+
+    def handle_request_data(self, request):
+        op = request.get('op')
+        match = provenance_matcher(parse_provenances(request.get('source')),
+                                   parse_provenances(request.get('exclude_source')))
+        if op == 'latest':
+            with self.lock:
+                return self.table.latest(request['file'], _ms(request.get('before')), _ms(request.get('after')),
+                                         match)
+        if op == 'plan':
+            path_filter = None
+            if request.get('glob') or request.get('ext'):
+                path_filter = compile_filter(extensions=request.get('ext'), globs=request.get('glob'))
+            with self.lock:
+                return self.table.plan(request.get('project') or str(PROJECT_PATH), _ms(request.get('before')),
+                                       _ms(request.get('after')), path_filter, match)
+        if op == 'export':
+            from .export import export_index
+            projects = request.get('project') or [str(PROJECT_PATH)]
+            path_filter = compile_filter(prefixes=projects) if not request.get('all') else None
+            # refresh 는 인덱스를 통째로 교체하고 이전 객체는 고치지 않으므로 참조만 잡고 lock 밖에서 내보낸다
+            with self.lock:
+                index = self.index
+            return export_index(iter_records(index, path_filter), Path(request['output']), ProjectRouter(projects))
+        if op == 'stats':
+            with self.lock:
+                return {'dirs': len(self.index['dirs']), 'files': len(self.table.files),
+                        'versions': sum(len(f[1]) for f in self.table.files.values())}
+        if op == 'refresh':
+            return self.refresh()
+        if op == 'shutdown':
+            # 실제 종료는 응답을 보낸 뒤 IndexRequestHandler 가 시작한다
+            self.stopped.set()
+            return True
+        raise ValueError(f"알 수 없는 요청: {op}")
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.unlink(self.server_address)
+        except OSError:
+            pass
+
+
+class IndexRequestHandler(socketserver.StreamRequestHandler):
+    """연결 하나에서 여러 요청을 순서대로 처리 (한 줄에 JSON 하나)"""
+
+    def handle(self):
+        for line in self.rfile:
+            request = None
+            try:
+                request = json.loads(line)
+                response = {'ok': True, 'result': self.server.handle_request_data(request)}
+            except Exception as e:
+                response = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+            self.wfile.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+            self.wfile.flush()
+            if response['ok'] and isinstance(request, dict) and request.get('op') == 'shutdown':
+                # 응답을 보낸 뒤에 종료 (shutdown 은 serve_forever 가 끝날 때까지 기다리므로 스레드로)
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="인덱스를 메모리에 두고 복구 질의에 답하는 서버")
+    parser.add_argument('--socket', default=str(SOCKET_PATH))
+    parser.add_argument('--history', default=str(HISTORY_PATH))
+    parser.add_argument('--index', default=str(INDEX_PATH))
+    parser.add_argument('--interval', type=float, default=REFRESH_INTERVAL, help="갱신 간격 (초)")
+    add_throttle_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if not hasattr(socket, 'AF_UNIX'):
+        print("[오류] 이 Python 에서는 Unix 소켓을 사용할 수 없습니다.")
+        return 1
+    try:
+        server = IndexServer(args.socket, args.history, args.index, args.interval, throttle_from_args(args))
+    except OSError as e:
+        print(f"[오류] {e}")
+        return 1
+
+    stats = server.handle_request_data({'op': 'stats'})
+    print(f"인덱스 서버 시작: {args.socket}")
+    print(f"  디렉토리 {stats['dirs']}개, 파일 {stats['files']}개, 버전 {stats['versions']}개")
+    threading.Thread(target=server.refresh_loop, daemon=True).start()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stopped.set()
+        server.server_close()
+    print("인덱스 서버 종료")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+import os
+import sys
+import json
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from .index import INDEX_PATH, INDEX_VERSION, index_history_dir, new_index, save_index
+from .scan import HISTORY_PATH
+
+SHARD_NAME = 'index-{shard:04d}-of-{count:04d}.json'
+
+
+def shard_of(name, count):
+    """히스토리 디렉토리 이름의 해시 앞 4바이트로 샤드 번호 결정 (어느 컴퓨터에서 계산해도 같음)"""
+    prefix = hashlib.blake2b(name.encode('utf-8'), digest_size=8).digest()[:4]
+    return int.from_bytes(prefix, 'big') % count
+
+
+def parse_shard(text):
+    """'3/16' -> (3, 16)"""
+    shard, _, count = text.partition('/')
+    shard, count = int(shard), int(count)
+    if not 0 <= shard < count:
+        raise ValueError(f"샤드 번호는 0 이상 {count} 미만이어야 합니다: {text}")
+    return shard, count
+
+
+def shard_dir_mtimes(history_path, shard, count):
+    """이 샤드에 속한 디렉토리만 {이름: mtime_ns} (다른 샤드의 디렉토리는 stat 하지 않음)"""
+    mtimes = {}
+    with os.scandir(history_path) as it:
+        for e in it:
+            if shard_of(e.name, count) != shard or not e.is_dir():
+                continue
+            try:
+                mtimes[e.name] = e.stat().st_mtime_ns
+            except OSError:
+                continue
+    return mtimes
+
+
+def shard_path(output_dir, shard, count):
+    return Path(output_dir) / SHARD_NAME.format(shard=shard, count=count)
+
+
+def build_shard(history_path, shard, count, output_dir):
+    """샤드 하나의 부분 인덱스 만들기 (index.py 와 같은 형식 + 'shard')
+
+    이전에 만든 부분 인덱스가 있으면 mtime 이 바뀐 디렉토리만 다시 읽습니다.
+    반환값: (이 샤드의 디렉토리 수, 새로 읽은 수)
+    """
+    history_path = Path(history_path)
+    output = shard_path(output_dir, shard, count)
+    try:
+        with open(output, 'r', encoding='utf-8') as f:
+            previous = json.load(f)['dirs']
+    except (OSError, ValueError, KeyError):
+        previous = {}
+
+    partial = new_index(history_path)
+    partial['shard'] = [shard, count]
+    read = 0
+    for name, mtime_ns in sorted(shard_dir_mtimes(history_path, shard, count).items()):
+        cached = previous.get(name)
+        if cached and cached['mtime_ns'] == mtime_ns:
+            partial['dirs'][name] = cached
+            continue
+        partial['dirs'][name] = index_history_dir(os.path.join(history_path, name), mtime_ns)
+        read += 1
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp = output.with_name(output.name + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(partial, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp, output)
+    return len(partial['dirs']), read
+
+
+def merge_shards(output_dir, count, history_path=None):
+    """부분 인덱스 count 개를 하나의 인덱스로 합치기
+
+    디렉토리는 이름순으로 넣으므로 샤드가 끝난 순서와 관계없이 결과가 같습니다.
+    history_path 를 주면 그 경로를 씁니다 (다른 컴퓨터에서 공유 폴더를 다른 경로로 연결한 경우).
+    """
+    partials = []
+    for shard in range(count):
+        path = shard_path(output_dir, shard, count)
+        if not path.exists():
+            raise FileNotFoundError(f"부분 인덱스가 없습니다: {path}")
+        with open(path, 'r', encoding='utf-8') as f:
+            partial = json.load(f)
+        if partial.get('version') != INDEX_VERSION or partial.get('shard') != [shard, count]:
+            raise ValueError(f"부분 인덱스 형식이 맞지 않습니다: {path}")
+        partials.append(partial)
+
+    index = new_index(history_path or partials[0]['history_path'])
+    dirs = {}
+    for partial in partials:
+        for name, item in partial['dirs'].items():
+            if name in dirs:
+                raise ValueError(f"두 샤드에 같은 디렉토리가 있습니다: {name}")
+            dirs[name] = item
+    index['dirs'] = {name: dirs[name] for name in sorted(dirs)}
+    return index
+
+
+def _build(args):
+    return build_shard(*args)
+
+
+def run_shards(history_path, count, output_dir, workers=None):
+    """count 개 샤드를 프로세스 workers 개로 나눠 실행, 샤드별 (디렉토리 수, 새로 읽은 수) 목록 반환"""
+    jobs = [(str(history_path), shard, count, str(output_dir)) for shard in range(count)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_build, jobs))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="히스토리를 여러 프로세스/컴퓨터로 나눠 인덱싱")
+    parser.add_argument('--history', default=str(HISTORY_PATH))
+    parser.add_argument('--output', default=str(INDEX_PATH.parent / 'shards'), help="부분 인덱스 폴더")
+    sub = parser.add_subparsers(dest='action', required=True)
+    build = sub.add_parser('build', help="샤드 하나만 만들기 (다른 컴퓨터에서 실행)")
+    build.add_argument('shard', type=parse_shard, help="예: 3/16")
+    run = sub.add_parser('run', help="이 컴퓨터에서 모든 샤드를 병렬로 만들고 합치기")
+    run.add_argument('--shards', type=int, default=os.cpu_count() or 4)
+    run.add_argument('--workers', type=int, default=None)
+    run.add_argument('--index', default=str(INDEX_PATH))
+    merge = sub.add_parser('merge', help="부분 인덱스를 합쳐 인덱스 저장")
+    merge.add_argument('--shards', type=int, required=True)
+    merge.add_argument('--index', default=str(INDEX_PATH))
+    args = parser.parse_args(argv)
+
+    history_path = Path(args.history)
+    if args.action == 'build':
+        shard, count = args.shard
+        total, read = build_shard(history_path, shard, count, args.output)
+        print(f"샤드 {shard}/{count}: 디렉토리 {total}개 (새로 읽음 {read}개) -> {shard_path(args.output, shard, count)}")
+        return 0
+
+    if args.action == 'run':
+        results = run_shards(history_path, args.shards, args.output, args.workers)
+        print(f"샤드 {args.shards}개: 디렉토리 {sum(r[0] for r in results)}개 "
+              f"(새로 읽음 {sum(r[1] for r in results)}개)")
+
+    try:
+        index = merge_shards(args.output, args.shards, history_path)
+    except (OSError, ValueError) as e:
+        print(f"[오류] {e}")
+        return 1
+    save_index(index, Path(args.index))
+    print(f"인덱스 저장: {args.index} (전체 {len(index['dirs'])}개 디렉토리)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+import os
+import mmap
+import difflib
+import hashlib
+from contextlib import contextmanager
+
+# 이 크기 이상인 스냅샷은 read() 대신 mmap 으로 연다
+MMAP_THRESHOLD = 256 * 1024
+# 비교할 때 한 번에 보는 크기
+COMPARE_CHUNK = 64 * 1024
+
+
+@contextmanager
+def open_snapshot(path, threshold=MMAP_THRESHOLD):
+    """스냅샷 파일을 memoryview 로 연다
+
+    threshold 이상인 파일은 mmap 으로 매핑하므로 파일 크기만큼 메모리를 할당하지 않습니다.
+    with 블록을 벗어나면 매핑이 닫히므로 memoryview(슬라이스 포함)를 밖으로 가져가면 안 됩니다.
+    원본 객체(bytes 또는 mmap)는 view.obj 로 접근할 수 있고, 둘 다 find() 를 지원합니다.
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < threshold or size == 0:
+            view = memoryview(f.read())
+            try:
+                yield view
+            finally:
+                view.release()
+            return
+
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mm)
+        try:
+            yield view
+        finally:
+            view.release()
+            mm.close()
+
+
+def hash_snapshot(path, algorithm='sha256', threshold=MMAP_THRESHOLD):
+    """스냅샷 내용의 해시값(hex) 계산"""
+    h = hashlib.new(algorithm)
+    with open_snapshot(path, threshold) as view:
+        for start in range(0, len(view), 1024 * 1024):
+            h.update(view[start:start + 1024 * 1024])
+    return h.hexdigest()
+
+
+def _common_prefix(a, b):
+    """두 memoryview 의 공통 앞부분 길이"""
+    limit = min(len(a), len(b))
+    pos = 0
+    while pos < limit:
+        end = min(pos + COMPARE_CHUNK, limit)
+        if a[pos:end] != b[pos:end]:
+            # 청크 안에서만 바이트 단위로 찾는다
+            chunk_a, chunk_b = a[pos:end].tobytes(), b[pos:end].tobytes()
+            for i in range(len(chunk_a)):
+                if chunk_a[i] != chunk_b[i]:
+                    return pos + i
+        pos = end
+    return limit
+
+
+def _common_suffix(a, b, prefix):
+    """공통 앞부분(prefix)과 겹치지 않는 공통 뒷부분 길이"""
+    limit = min(len(a), len(b)) - prefix
+    length = 0
+    while length < limit:
+        step = min(COMPARE_CHUNK, limit - length)
+        end_a, end_b = len(a) - length, len(b) - length
+        if a[end_a - step:end_a] != b[end_b - step:end_b]:
+            chunk_a = a[end_a - step:end_a].tobytes()
+            chunk_b = b[end_b - step:end_b].tobytes()
+            for i in range(1, step + 1):
+                if chunk_a[-i] != chunk_b[-i]:
+                    return length + i - 1
+        length += step
+    return limit
+
+
+def _forward_lines(buf, pos, count):
+    """pos 에서 줄바꿈 count 개를 지난 위치"""
+    for _ in range(count):
+        nl = buf.find(b'\n', pos)
+        if nl == -1:
+            return len(buf)
+        pos = nl + 1
+    return pos
+
+
+def _count_newlines(view, end):
+    """view[:end] 안의 줄바꿈 개수 (청크 단위로 세서 큰 복사를 피함)"""
+    total = 0
+    for start in range(0, end, COMPARE_CHUNK):
+        total += view[start:min(start + COMPARE_CHUNK, end)].tobytes().count(b'\n')
+    return total
+
+
+def _format_range(start, stop):
+    """unified diff 의 범위 표기 (difflib 과 같은 형식)"""
+    length = stop - start
+    if length == 1:
+        return f"{start + 1}"
+    if not length:
+        start -= 1
+    return f"{start + 1},{length}"
+
+
+def snapshots_equal(path_a, path_b, threshold=MMAP_THRESHOLD):
+    """두 스냅샷 내용이 같은지 비교 (크기가 다르면 열지 않음)"""
+    if os.path.getsize(path_a) != os.path.getsize(path_b):
+        return False
+    with open_snapshot(path_a, threshold) as a, open_snapshot(path_b, threshold) as b:
+        return _common_prefix(a, b) == len(a)
+
+
+def search_snapshot(path, needle, threshold=MMAP_THRESHOLD):
+    """스냅샷에서 needle(bytes 또는 str) 이 처음 나오는 위치, 없으면 -1"""
+    if isinstance(needle, str):
+        needle = needle.encode('utf-8')
+    with open_snapshot(path, threshold) as view:
+        return view.obj.find(needle)
+
+
+def diff_snapshots(path_a, path_b, label_a=None, label_b=None, context=3,
+                   encoding='utf-8', threshold=MMAP_THRESHOLD):
+    """두 스냅샷의 unified diff 줄 목록
+
+    공통 앞/뒷부분은 memoryview 상에서 잘라내고, 달라진 가운데 부분만 디코딩해서 비교합니다.
+    """
+    label_a = label_a or str(path_a)
+    label_b = label_b or str(path_b)
+
+    with open_snapshot(path_a, threshold) as a, open_snapshot(path_b, threshold) as b:
+        prefix = _common_prefix(a, b)
+        if prefix == len(a) == len(b):
+            return []
+        suffix = _common_suffix(a, b, prefix)
+
+        # 줄 단위로 맞추고, 앞뒤로 context 줄만큼 더 포함시킨다
+        head = a.obj.rfind(b'\n', 0, prefix) + 1
+        for _ in range(context):
+            if head == 0:
+                break
+            head = a.obj.rfind(b'\n', 0, head - 1) + 1
+        tail_a = _forward_lines(a.obj, len(a) - suffix, context + 1)
+        tail_b = _forward_lines(b.obj, len(b) - suffix, context + 1)
+        line_offset = _count_newlines(a, head)
+        lines_a = str(a[head:tail_a], encoding, 'replace').splitlines(keepends=True)
+        lines_b = str(b[head:tail_b], encoding, 'replace').splitlines(keepends=True)
+
+    result = [f"--- {label_a}\n", f"+++ {label_b}\n"]
+    matcher = difflib.SequenceMatcher(None, lines_a, lines_b, autojunk=False)
+    for group in matcher.get_grouped_opcodes(context):
+        i1, i2 = group[0][1], group[-1][2]
+        j1, j2 = group[0][3], group[-1][4]
+        result.append(
+            f"@@ -{_format_range(line_offset + i1, line_offset + i2)} "
+            f"+{_format_range(line_offset + j1, line_offset + j2)} @@\n"
+        )
+        for tag, a1, a2, b1, b2 in group:
+            if tag == 'equal':
+                result.extend(' ' + line for line in lines_a[a1:a2])
+                continue
+            if tag in ('replace', 'delete'):
+                result.extend('-' + line for line in lines_a[a1:a2])
+            if tag in ('replace', 'insert'):
+                result.extend('+' + line for line in lines_b[b1:b2])
+    return result
+
+
+def git_blob_hash(path, threshold=MMAP_THRESHOLD):
+    """git 의 blob id 와 같은 방식의 해시 (git hash-object 와 같은 값)
+
+    HEAD 의 blob id 와 바로 비교할 수 있으므로 git 쪽 내용은 읽지 않아도 됩니다.
+    """
+    h = hashlib.sha1()
+    with open_snapshot(path, threshold) as view:
+        h.update(b'blob %d\0' % len(view))
+        for start in range(0, len(view), 1024 * 1024):
+            h.update(view[start:start + 1024 * 1024])
+    return h.hexdigest()
@@ -0,0 +1,117 @@
+import os
+import sys
+import time
+import threading
+
+SIZE_UNITS = {'': 1, 'k': 1024, 'm': 1024 ** 2, 'g': 1024 ** 3}
+# 지연이 기준의 이 배수를 넘으면 쉬는 시간을 늘림
+BACKOFF_RATIO = 3.0
+MAX_BACKOFF = 1.0
+
+# Linux ioprio_set (x86_64, aarch64 의 syscall 번호)
+IOPRIO_SYSCALLS = {'x86_64': 251, 'aarch64': 30}
+IOPRIO_WHO_PROCESS = 1
+IOPRIO_CLASS_IDLE = 3
+IOPRIO_CLASS_SHIFT = 13
+# Windows SetPriorityClass: 디스크/메모리 우선순위를 백그라운드로
+PROCESS_MODE_BACKGROUND_BEGIN = 0x00100000
+
+
+def parse_size(text):
+    """'512k', '2M' 같은 크기를 bytes 로"""
+    text = text.strip().lower().rstrip('b')
+    unit = text[-1] if text and text[-1] in SIZE_UNITS else ''
+    return int(float(text[:len(text) - len(unit)]) * SIZE_UNITS[unit])
+
+
+def lower_priority():
+    """현재 프로세스의 CPU/디스크 우선순위를 낮추고 적용한 항목 목록 반환"""
+    applied = []
+    if hasattr(os, 'nice'):
+        try:
+            os.nice(10)
+            applied.append('nice 10')
+        except OSError:
+            pass
+    if sys.platform.startswith('linux'):
+        syscall_number = IOPRIO_SYSCALLS.get(os.uname().machine)
+        if syscall_number:
+            import ctypes
+            libc = ctypes.CDLL(None, use_errno=True)
+            if libc.syscall(syscall_number, IOPRIO_WHO_PROCESS, 0,
+                            IOPRIO_CLASS_IDLE << IOPRIO_CLASS_SHIFT) == 0:
+                applied.append('ioprio idle')
+    elif sys.platform == 'win32':
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        if kernel32.SetPriorityClass(kernel32.GetCurrentProcess(), PROCESS_MODE_BACKGROUND_BEGIN):
+            applied.append('background mode')
+    return applied
+
+
+class Throttle:
+    """초당 작업 수(iops)/바이트(bandwidth) 제한 + 지연이 늘면 쉬어 가기
+
+    wait() 로 작업 전에 한도를 지키고, 작업 후 record() 로 걸린 시간을 알려주면
+    최근 지연(지수 평균)이 기준 지연의 BACKOFF_RATIO 배를 넘을 때 쉬는 시간을 두 배로 늘리고,
+    내려가면 절반으로 줄입니다. 여러 스레드에서 같이 써도 됩니다.
+    """
+
+    def __init__(self, iops=None, bandwidth=None, adaptive=True):
+        self.iops = iops
+        self.bandwidth = bandwidth
+        self.adaptive = adaptive
+        self.lock = threading.Lock()
+        self.next_op = time.monotonic()
+        self.next_byte = time.monotonic()
+        self.latency = None
+        self.baseline = None
+        self.backoff = 0.0
+        self.slept = 0.0
+
+    def wait(self, ops=1, nbytes=0):
+        with self.lock:
+            now = time.monotonic()
+            ready = now
+            if self.iops:
+                ready = max(ready, self.next_op)
+                self.next_op = max(self.next_op, now) + ops / self.iops
+            if self.bandwidth and nbytes:
+                ready = max(ready, self.next_byte)
+                self.next_byte = max(self.next_byte, now) + nbytes / self.bandwidth
+            delay = ready - now + self.backoff
+        if delay > 0:
+            self.slept += delay
+            time.sleep(delay)
+
+    def record(self, seconds):
+        if not self.adaptive:
+            return
+        with self.lock:
+            self.latency = seconds if self.latency is None else 0.8 * self.latency + 0.2 * seconds
+            # 기준은 천천히 올라가서 계속 유지되는 지연(예: 캐시 밖 디렉토리)은 결국 정상으로 받아들인다
+            self.baseline = self.latency if self.baseline is None else min(self.baseline * 1.05, self.latency)
+            if self.latency > self.baseline * BACKOFF_RATIO:
+                self.backoff = min(MAX_BACKOFF, max(self.backoff * 2, 0.001))
+            else:
+                self.backoff /= 2
+                if self.backoff < 0.0005:
+                    self.backoff = 0.0
+
+
+def add_throttle_arguments(parser):
+    """argparse 에 --background / --iops / --bandwidth 추가"""
+    parser.add_argument('--background', action='store_true',
+                        help="낮은 CPU/디스크 우선순위 + 지연이 늘면 쉬어 가기 (편집기를 방해하지 않게)")
+    parser.add_argument('--iops', type=float, help="초당 I/O 작업 수 제한 (히스토리 디렉토리 하나 = 2)")
+    parser.add_argument('--bandwidth', type=parse_size, help="초당 읽기 바이트 제한 (예: 2M)")
+
+
+def throttle_from_args(args):
+    """옵션에 따라 우선순위를 낮추고 Throttle 반환 (제한이 없으면 None)"""
+    if args.background:
+        applied = lower_priority()
+        print(f"백그라운드 모드: {', '.join(applied) or '우선순위 변경 불가'}")
+    if not (args.background or args.iops or args.bandwidth):
+        return None
+    return Throttle(args.iops, args.bandwidth)
@@ -0,0 +1,181 @@
+import os
+import sys
+import shutil
+import argparse
+import tempfile
+import subprocess
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .copy_strategies import DEFAULT_STRATEGIES, copy_snapshot
+from .filters import compile_filter
+from .index import INDEX_PATH, iter_records, update_index
+from .paths import ProjectRouter
+from .scan import HISTORY_PATH, PROJECT_PATH
+
+# 작업 트리를 임시 폴더로 옮길 때 제외하는 폴더 (node_modules 는 심볼릭 링크로 연결)
+SKIP_DIRS = {'.git', 'node_modules', '.cursor-history-journal'}
+
+
+def tree_versions(records, project_path):
+    """파일별 버전 목록, {상대 경로: ([timestamp], [레코드])} (오래된 순)"""
+    router = ProjectRouter({'project': project_path})
+    files = {}
+    for record in records:
+        _, relative_path = router.route(record['file_path'])
+        if relative_path is None:
+            continue
+        files.setdefault(str(relative_path), []).append(record)
+    result = {}
+    for relative_path, versions in files.items():
+        versions.sort(key=lambda r: (r['timestamp'], str(r['history_file'])))
+        result[relative_path] = ([r['timestamp'] for r in versions], versions)
+    return result
+
+
+def candidate_times(files):
+    """트리 내용이 바뀌는 시점 목록 (오래된 순)"""
+    return sorted({t for timestamps, _ in files.values() for t in timestamps})
+
+
+def tree_at(files, timestamp):
+    """timestamp 시점의 트리, {상대 경로: 레코드} (그 시점에 히스토리가 없는 파일은 빠짐)"""
+    tree = {}
+    for relative_path, (timestamps, versions) in files.items():
+        i = bisect_right(timestamps, timestamp)
+        if i:
+            tree[relative_path] = versions[i - 1]
+    return tree
+
+
+def link_node_modules(source, link):
+    """node_modules 를 심볼릭 링크로 연결, 실패하면 (Windows 에서 권한이 없을 때) 디렉토리 junction 으로
+
+    둘 다 안 되면 연결하지 않고 False 를 반환합니다 (검사 명령이 node_modules 를 직접 찾아야 함).
+    """
+    try:
+        os.symlink(source, link, target_is_directory=True)
+        return True
+    except OSError as e:
+        error = e
+    if os.name == 'nt':
+        import _winapi
+        try:
+            _winapi.CreateJunction(str(source), str(link))
+            return True
+        except OSError as e:
+            error = e
+    print(f"   [주의] node_modules 를 연결하지 못했습니다 ({error}), 검사 명령이 직접 찾아야 합니다")
+    return False
+
+
+def materialize(tree, scratch, project_path=None, prefix=''):
+    """임시 폴더에 트리 만들기
+
+    project_path 를 주면 현재 작업 트리를 먼저 깔고(히스토리에 없는 설정 파일 등) 그 위에 스냅샷을 덮습니다.
+    prefix(프로젝트 기준 폴더) 아래는 작업 트리에서 가져오지 않고 스냅샷만 쓰므로,
+    그 시점 이후에 생긴 파일은 트리에 없습니다 (prefix 가 빈 문자열이면 작업 트리 파일을 하나도 쓰지 않음).
+    검사 명령이 파일을 수정할 수 있으므로 하드링크는 쓰지 않고 reflink 또는 복사로 만듭니다.
+    """
+    scratch = Path(scratch)
+    if project_path is not None and not prefix:
+        project_path = Path(project_path)
+        if (project_path / 'node_modules').is_dir():
+            link_node_modules(project_path / 'node_modules', scratch / 'node_modules')
+    elif project_path is not None:
+        project_path = Path(project_path)
+        prefix_path = Path(prefix)
+        for root, dirs, names in os.walk(project_path):
+            rel_root = Path(root).relative_to(project_path)
+            if 'node_modules' in dirs and rel_root == Path('.'):
+                link_node_modules(project_path / 'node_modules', scratch / 'node_modules')
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS and rel_root / d != prefix_path]
+            (scratch / rel_root).mkdir(parents=True, exist_ok=True)
+            for name in names:
+                if rel_root / name != prefix_path:
+                    copy_snapshot(Path(root) / name, scratch / rel_root / name, DEFAULT_STRATEGIES)
+
+    for relative_path, record in tree.items():
+        target = scratch / relative_path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        copy_snapshot(record['history_file'], target, DEFAULT_STRATEGIES)
+
+
+def run_check(files, timestamp, command, project_path=None, keep=False, prefix=''):
+    """timestamp 시점 트리에서 command 실행, 성공(종료 코드 0) 여부 반환"""
+    scratch = tempfile.mkdtemp(prefix='cursor-bisect-')
+    try:
+        materialize(tree_at(files, timestamp), scratch, project_path, prefix)
+        result = subprocess.run(command, shell=True, cwd=scratch,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return result.returncode == 0
+    finally:
+        if keep:
+            print(f"   임시 트리: {scratch}")
+        else:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+
+def kary_bisect(count, check, workers=4):
+    """통과...통과 실패...실패 순서인 0..count-1 중 마지막 통과 위치 (없으면 None)
+
+    한 라운드에 workers 개의 위치를 병렬로 검사해서 구간을 workers+1 등분으로 줄입니다.
+    check(i) 는 여러 스레드에서 동시에 호출됩니다.
+    """
+    lo, hi = -1, count  # lo 는 통과(또는 시작 전), hi 는 실패(또는 끝 다음)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while hi - lo > 1:
+            span = hi - lo - 1
+            k = min(workers, span)
+            points = sorted({lo + 1 + (span * (j + 1)) // (k + 1) for j in range(k)})
+            results = dict(zip(points, executor.map(check, points)))
+            for point in points:
+                if results[point]:
+                    lo = point
+                else:
+                    hi = point
+                    break
+    return lo if lo >= 0 else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="프로젝트 트리 전체가 검사를 통과한 마지막 시점 찾기")
+    parser.add_argument('command', help="임시 트리에서 실행할 명령 (예: \"npx tsc --noEmit\")")
+    parser.add_argument('--prefix', default='src', help="히스토리로 재구성할 폴더 (프로젝트 기준)")
+    parser.add_argument('--project', default=str(PROJECT_PATH))
+    parser.add_argument('--history', default=str(HISTORY_PATH))
+    parser.add_argument('--index', default=str(INDEX_PATH))
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 4)
+    parser.add_argument('--no-worktree', action='store_true', help="현재 작업 트리를 깔지 않고 스냅샷만으로 실행")
+    parser.add_argument('--keep', action='store_true', help="임시 트리를 지우지 않음")
+    args = parser.parse_args(argv)
+
+    project_path = Path(args.project)
+    prefix_path = project_path / args.prefix if args.prefix else project_path
+    index = update_index(Path(args.history), Path(args.index))
+    files = tree_versions(iter_records(index, compile_filter(prefixes=[prefix_path])), project_path)
+    candidates = candidate_times(files)
+    if not candidates:
+        print(f"[오류] {prefix_path} 아래 히스토리가 없습니다.")
+        return 1
+    print(f"파일 {len(files)}개, 후보 시점 {len(candidates)}개, 동시 검사 {args.workers}개")
+
+    def check(i):
+        passed = run_check(files, candidates[i], args.command,
+                           None if args.no_worktree else project_path, args.keep, args.prefix)
+        print(f"  {candidates[i].strftime('%Y-%m-%d %H:%M:%S')}: {'통과' if passed else '실패'}")
+        return passed
+
+    found = kary_bisect(len(candidates), check, args.workers)
+    if found is None:
+        print("\n통과한 시점이 없습니다.")
+        return 1
+    print(f"\n마지막으로 통과한 시점: {candidates[found].strftime('%Y-%m-%d %H:%M:%S')}")
+    if found + 1 < len(candidates):
+        print(f"처음 실패한 시점: {candidates[found + 1].strftime('%Y-%m-%d %H:%M:%S')}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,292 @@
+import os
+import re
+import json
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from .conflicts import SNAPSHOT_HASH_CACHE_PATH, HashCache
+from .restore import plan_restore
+from .snapshot import open_snapshot
+
+# 검사 결과 캐시: {"종류:내용 해시": 문제(없으면 null)}
+VALIDATION_CACHE_PATH = Path.home() / '.cursor_history' / 'snapshot-checks.json'
+# 검사 규칙이 바뀌면 올림 (이전 결과는 버림)
+VALIDATION_VERSION = 1
+# 검사할 스냅샷이 이보다 적으면 프로세스 풀을 띄우지 않음
+POOL_THRESHOLD = 32
+# 해시할 때 한 번에 넘기는 크기
+HASH_CHUNK = 1024 * 1024
+
+# 주석/끝 쉼표를 허용하는 JSON (tsconfig.json 등)
+JSONC_NAMES = re.compile(r'^(?:tsconfig|jsconfig)(?:\..+)?\.json$|\.jsonc$')
+SCRIPT_EXTENSIONS = {'.ts', '.tsx', '.js', '.jsx', '.mjs', '.cjs'}
+STYLE_EXTENSIONS = {'.css', '.scss', '.less'}
+
+_JSONC_RE = re.compile(r'"(?:\\.|[^"\\])*"|//[^\n]*|/\*.*?\*/|,(?=\s*[}\]])', re.S)
+_TOKEN_RE = re.compile(r'[()\[\]{}\'"`/]')
+_TEMPLATE_RE = re.compile(r'\\.|`|\$\{', re.S)
+_CLOSERS = {')': '(', ']': '[', '}': '{'}
+# 이 문자/단어 다음의 / 는 나눗셈이 아니라 정규식 리터럴의 시작
+_REGEX_AFTER = set('(,=:[!&|?{};+-*%~^')
+_REGEX_KEYWORD_RE = re.compile(r'\b(?:return|typeof|case|in|of|void|delete|throw|yield|await)\s*$')
+
+
+def snapshot_kind(file_path):
+    """파일 경로에 맞는 검사 종류, 검사하지 않는 파일이면 None"""
+    name = Path(file_path).name.lower()
+    if JSONC_NAMES.search(name):
+        return 'jsonc'
+    if name.endswith('.json'):
+        return 'json'
+    suffix = Path(name).suffix
+    if suffix in SCRIPT_EXTENSIONS:
+        return 'script'
+    if suffix in STYLE_EXTENSIONS:
+        return 'style'
+    return None
+
+
+def _string_end(text, start, quote):
+    """같은 줄에서 닫는 따옴표 위치, 없으면 -1 (JSX 텍스트의 ' 는 문자열이 아님)"""
+    i = start + 1
+    while True:
+        end = min((p for p in (text.find(quote, i), text.find('\\', i), text.find('\n', i)) if p != -1),
+                  default=-1)
+        if end == -1 or text[end] == '\n':
+            return -1
+        if text[end] == quote:
+            return end
+        i = end + 2
+
+
+def _regex_end(text, start):
+    """start 의 / 가 정규식 리터럴이면 닫는 / 위치, 아니면 -1 (같은 줄 안에서만 찾음)"""
+    j = start - 1
+    while j >= 0 and text[j] in ' \t\r\n':
+        j -= 1
+    if j >= 0 and text[j] not in _REGEX_AFTER and not _REGEX_KEYWORD_RE.search(text, max(0, j - 10), j + 1):
+        return -1
+    i = start + 1
+    in_class = False
+    while i < len(text):
+        c = text[i]
+        if c == '\n':
+            return -1
+        if c == '\\':
+            i += 2
+            continue
+        if c == '[':
+            in_class = True
+        elif c == ']':
+            in_class = False
+        elif c == '/' and not in_class:
+            return i
+        i += 1
+    return -1
+
+
+def check_brackets(text, line_comments=True):
+    """괄호 (), [], {} 와 템플릿 문자열이 맞게 닫혔는지 (문자열/주석 안은 건너뜀), 문제가 있으면 설명
+
+    잘리거나 쓰다 만 파일을 찾기 위한 간단한 검사라 정규식 리터럴은 앞 문자로만 구분합니다.
+    """
+    stack = []
+    i, n = 0, len(text)
+    while i < n:
+        if stack and stack[-1] == '`':
+            m = _TEMPLATE_RE.search(text, i)
+            if m is None:
+                break
+            i = m.end()
+            if m.group() == '`':
+                stack.pop()
+            elif m.group() == '${':
+                stack.append('${')
+            continue
+        m = _TOKEN_RE.search(text, i)
+        if m is None:
+            break
+        i = m.start()
+        c = text[i]
+        if c == '/':
+            nxt = text[i + 1:i + 2]
+            if nxt == '*':
+                end = text.find('*/', i + 2)
+                if end == -1:
+                    return "닫히지 않은 주석"
+                i = end + 2
+                continue
+            # http:// 같은 JSX 텍스트는 주석이 아님
+            if nxt == '/' and line_comments and text[i - 1:i] != ':':
+                end = text.find('\n', i + 2)
+                i = n if end == -1 else end + 1
+                continue
+            if line_comments:
+                end = _regex_end(text, i)
+                if end != -1:
+                    i = end + 1
+                    continue
+        elif c in '\'"':
+            end = _string_end(text, i, c)
+            if end != -1:
+                i = end + 1
+                continue
+        elif c == '`' and line_comments:
+            stack.append('`')
+        elif c in '([{':
+            stack.append(c)
+        elif c in _CLOSERS:
+            if c == '}' and stack and stack[-1] == '${':
+                stack.pop()
+            elif not stack or stack[-1] != _CLOSERS[c]:
+                return f"괄호 불일치 '{c}' ({text.count(chr(10), 0, i) + 1}번째 줄)"
+            else:
+                stack.pop()
+        i += 1
+    if stack:
+        return f"닫히지 않은 괄호 {len(stack)}개"
+    return None
+
+
+def check_snapshot_data(data, kind):
+    """스냅샷 내용(bytes 또는 open_snapshot 의 memoryview) 검사, 문제가 있으면 설명 문자열, 없으면 None"""
+    if not len(data):
+        return "빈 파일"
+    # memoryview 는 원본(bytes 또는 mmap)의 find() 로 복사 없이 찾는다
+    source = data.obj if isinstance(data, memoryview) else data
+    if source.find(b'\0') != -1:
+        return "NUL 바이트 (쓰다 만 파일)"
+    if kind in ('json', 'jsonc'):
+        try:
+            text = str(data, 'utf-8-sig')
+        except UnicodeDecodeError:
+            return "UTF-8 이 아님"
+        if kind == 'jsonc':
+            text = _JSONC_RE.sub(lambda m: m.group() if m.group().startswith('"') else '', text)
+        try:
+            json.loads(text)
+        except ValueError as e:
+            return f"JSON 오류: {e}"
+        return None
+    # 괄호는 ASCII 라 EUC-KR 같은 오래된 인코딩 파일도 latin-1 로 읽으면 충분
+    return check_brackets(str(data, 'latin-1'), line_comments=(kind == 'script'))
+
+
+def _check_file(job):
+    """프로세스 풀 작업: (경로, 종류) -> (크기, mtime_ns, git blob 해시, 문제)"""
+    path, kind = job
+    try:
+        # 읽기 전에 stat 해야 읽는 도중 바뀐 파일의 해시가 새 mtime 으로 저장되지 않음
+        st = os.stat(path)
+        with open_snapshot(path) as view:
+            h = hashlib.sha1()
+            h.update(b'blob %d\0' % len(view))
+            for start in range(0, len(view), HASH_CHUNK):
+                h.update(view[start:start + HASH_CHUNK])
+            problem = check_snapshot_data(view, kind)
+    except OSError as e:
+        return None, None, None, f"읽을 수 없음: {e}"
+    return st.st_size, st.st_mtime_ns, h.hexdigest(), problem
+
+
+class SnapshotValidator:
+    """스냅샷이 쓸 만한지 검사 (빈 파일, 깨진 JSON, 괄호가 안 맞는 TSX 등)
+
+    결과는 내용 해시(conflicts.HashCache 의 git blob id)를 키로 저장하므로,
+    같은 내용은 다시 검사하지 않고 해시도 파일 크기/mtime 이 같으면 다시 계산하지 않습니다.
+    캐시에 없는 스냅샷은 프로세스 풀에서 해시와 검사를 한 번에 읽어 처리합니다.
+    """
+
+    def __init__(self, cache_file=VALIDATION_CACHE_PATH, hash_cache=None, workers=None):
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.hash_cache = hash_cache or HashCache(str(SNAPSHOT_HASH_CACHE_PATH))
+        self.workers = workers
+        self.results = {}
+        self.checked = 0
+        if self.cache_file and self.cache_file.exists():
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == VALIDATION_VERSION:
+                    self.results = data['results']
+            except (OSError, ValueError, KeyError):
+                pass
+
+    def problems(self, records):
+        """레코드 중 문제가 있는 것: {history_file 경로 문자열: 설명}"""
+        found = {}
+        pending = []
+        for record in records:
+            kind = snapshot_kind(record['file_path'])
+            if kind is None:
+                continue
+            path = str(record['history_file'])
+            if not record['size']:
+                found[path] = "빈 파일"
+                continue
+            try:
+                digest = self.hash_cache.cached_hash(path, os.stat(path))
+            except OSError:
+                found[path] = "스냅샷 파일이 없음"
+                continue
+            key = f"{kind}:{digest}"
+            if digest is not None and key in self.results:
+                if self.results[key]:
+                    found[path] = self.results[key]
+                continue
+            pending.append((path, kind))
+
+        if len(pending) < POOL_THRESHOLD:
+            outcomes = map(_check_file, pending)
+            self._collect(pending, outcomes, found)
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                outcomes = executor.map(_check_file, pending, chunksize=16)
+                self._collect(pending, outcomes, found)
+        return found
+
+    def _collect(self, pending, outcomes, found):
+        for (path, kind), (size, mtime_ns, digest, problem) in zip(pending, outcomes):
+            self.checked += 1
+            if digest is not None:
+                self.hash_cache.store(path, size, mtime_ns, digest)
+                self.results[f"{kind}:{digest}"] = problem
+            if problem:
+                found[path] = problem
+
+    def save(self):
+        self.hash_cache.save()
+        if not self.cache_file:
+            return
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_file.with_name(self.cache_file.name + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'version': VALIDATION_VERSION, 'results': self.results}, f)
+        os.replace(tmp, self.cache_file)
+
+
+def plan_restore_validated(records, project_path, before=None, after=None, match=None, validator=None):
+    """plan_restore 와 같은 계획이지만 문제가 있는 스냅샷은 건너뛰고 그 이전 버전을 고름
+
+    계획에 오른 버전만 한꺼번에 검사하고, 문제가 있는 버전을 빼고 다시 계획하기를 반복합니다.
+    쓸 만한 버전이 하나도 없는 파일은 원래대로 가장 최신 버전을 둡니다.
+    반환값: (계획, {history_file: 설명} 건너뛴 버전, [쓸 만한 버전이 없는 대상 경로])
+    """
+    validator = validator or SnapshotValidator()
+    first = plan = plan_restore(records, project_path, before, after, match)
+    skipped = {}
+    while True:
+        problems = validator.problems(record for record, _ in plan)
+        if not problems:
+            break
+        skipped.update(problems)
+        records = [r for r in records if str(r['history_file']) not in problems]
+        plan = plan_restore(records, project_path, before, after, match)
+    validator.save()
+
+    targets = {target for _, target in plan}
+    unusable = [(record, target) for record, target in first if target not in targets]
+    if unusable:
+        plan = sorted(plan + unusable, key=lambda x: str(x[1]))
+    return plan, skipped, [target for _, target in unusable]
@@ -0,0 +1,39 @@
+from .filters import compile_filter
+from .paths import ProjectRouter
+from .scan import HISTORY_PATH, scan_history
+
+
+def scan_workspaces(roots, history_path=HISTORY_PATH, concurrency=None, **filter_options):
+    """히스토리를 한 번만 스캔해서 여러 프로젝트의 레코드를 나눠 담기
+
+    roots 는 {이름: 루트 경로} 또는 루트 경로 목록입니다.
+    루트 경로들이 prefix 조건으로 스캐너에 전달되므로 다른 프로젝트의 디렉토리는 스냅샷을 건드리지 않고 버려집니다.
+    각 레코드에는 'project' 와 'relative_path' 가 추가됩니다.
+    filter_options 는 compile_filter 에 그대로 전달됩니다 (prefixes 제외).
+    """
+    router = ProjectRouter(roots)
+    path_filter = compile_filter(prefixes=list(router.roots.values()), **filter_options)
+
+    if concurrency:
+        from .async_scan import scan_history_concurrent
+        records = scan_history_concurrent(history_path, path_filter, concurrency)
+    else:
+        records = scan_history(history_path, path_filter)
+
+    return split_by_project(records, router)
+
+
+def split_by_project(records, router):
+    """레코드를 프로젝트별로 나누기, {이름: [레코드]} (어느 프로젝트에도 속하지 않으면 버림)
+
+    각 레코드에는 'project' 와 'relative_path' 가 추가됩니다.
+    """
+    projects = {name: [] for name in router.roots}
+    for record in records:
+        name, relative_path = router.route(record['file_path'])
+        if name is None:
+            continue
+        record['project'] = name
+        record['relative_path'] = relative_path
+        projects[name].append(record)
+    return projects
@@ -0,0 +1,37 @@
+import pytest
+
+from cursor_history.binindex import BinaryIndex, binary_index_current, write_binary_index
+from cursor_history.paths import encode_file_uri
+
+PATHS = ['/p/site/src/pages/home/page.tsx', '/p/site/src/pages/about/page.tsx', '/p/admin/src/pages/home/page.tsx',
+         '/p/site/src/a.ts', '/p/site/src/ba.ts']
+
+
+@pytest.fixture
+def binary(tmp_path):
+    index = {'history_path': '/h', 'dirs': {
+        f'd{i}': {'resource': encode_file_uri(path), 'entries': [['e', i, None, 1, None]]}
+        for i, path in enumerate(PATHS)}}
+    path = tmp_path / 'index.bin'
+    write_binary_index(index, path)
+    assert binary_index_current(path)
+    with BinaryIndex(path) as binary:
+        yield binary
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('about/page.tsx', '/p/site/src/pages/about/page.tsx'),
+    ('site/src/pages/home/page.tsx', '/p/site/src/pages/home/page.tsx'),
+    ('/p/site/src/a.ts', '/p/site/src/a.ts'),
+    ('a.ts', '/p/site/src/a.ts'),
+    ('src/ba.ts', '/p/site/src/ba.ts'),
+    ('x.ts', None),
+])
+def test_find_suffix(binary, query, expected):
+    position = binary.find_suffix(query)
+    assert (binary.resource(position)[1] if position is not None else None) == expected
+
+
+def test_find_suffix_ambiguous(binary):
+    with pytest.raises(ValueError):
+        binary.find_suffix('pages/home/page.tsx')
@@ -0,0 +1,13 @@
+import pytest
+
+from cursor_history.cli import HEAVY_MODULES, IMPORT_BUDGET_MS, STARTUP_CHECKS, measure_imports
+
+
+@pytest.mark.parametrize('argv', STARTUP_CHECKS, ids=' '.join)
+def test_startup_import_budget(argv):
+    imports = measure_imports(argv)
+    assert 'cursor_history.cli' in imports or 'cursor_history' in imports
+    own_ms = sum(us for name, (us, nested) in imports.items()
+                 if not nested and name.split('.')[0] == 'cursor_history') / 1000
+    assert own_ms <= IMPORT_BUDGET_MS
+    assert not {name.split('.')[0] for name in imports} & set(HEAVY_MODULES)
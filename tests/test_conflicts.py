@@ -0,0 +1,64 @@
+import subprocess
+from datetime import datetime
+
+import pytest
+
+from cursor_history.conflicts import (
+    DIVERGED, SNAPSHOT_NEWER, already_merged, merge_diverged, orig_path, restore_with_conflicts,
+)
+from cursor_history.journal import Journal, rollback
+
+
+def _diverged(tmp_path, snapshot):
+    target = tmp_path / 'page.tsx'
+    target.write_bytes(b'local work\n')
+    return {'target': str(target), 'head_hash': None, 'record': {'history_file': snapshot}}
+
+
+def test_failed_merge_leaves_no_orig(tmp_path):
+    result = _diverged(tmp_path, tmp_path / 'missing-snapshot')
+    with pytest.raises(RuntimeError):
+        merge_diverged(result, tmp_path)
+    assert not (tmp_path / 'page.tsx.orig').exists()
+    assert (tmp_path / 'page.tsx').read_bytes() == b'local work\n'
+    assert not already_merged(result['target'])
+
+
+def test_merge_keeps_orig(tmp_path):
+    snapshot = tmp_path / 'snapshot'
+    snapshot.write_bytes(b'snapshot work\n')
+    result = _diverged(tmp_path, snapshot)
+    assert merge_diverged(result, tmp_path) == 1
+    assert open(orig_path(result['target']), 'rb').read() == b'local work\n'
+    assert already_merged(result['target'])
+    with pytest.raises(FileExistsError):
+        merge_diverged(result, tmp_path)
+
+
+def test_journaled_conflict_restore_rolls_back(tmp_path):
+    project = tmp_path / 'project'
+    project.mkdir()
+    for name, content in (('new.tsx', b'head\n'), ('both.tsx', b'head\n')):
+        (project / name).write_bytes(content)
+    git = ['git', '-C', str(project), '-c', 'user.name=t', '-c', 'user.email=t@t']
+    subprocess.run(git + ['init', '-q'], check=True)
+    subprocess.run(git + ['add', '.'], check=True)
+    subprocess.run(git + ['commit', '-qm', 'base'], check=True)
+    (project / 'both.tsx').write_bytes(b'local\n')
+
+    plan = []
+    for name in ('new.tsx', 'both.tsx'):
+        snapshot = tmp_path / f'{name}.snapshot'
+        snapshot.write_bytes(b'snapshot\n')
+        plan.append(({'history_file': snapshot, 'timestamp': datetime(2024, 5, 1)}, project / name))
+
+    with Journal(project) as journal:
+        results = restore_with_conflicts(plan, project, journal=journal)
+    assert {r['status'] for r in results} == {SNAPSHOT_NEWER, DIVERGED}
+    assert (project / 'new.tsx').read_bytes() == b'snapshot\n'
+    assert (project / 'both.tsx.orig').exists()
+
+    rollback(journal.dir)
+    assert (project / 'new.tsx').read_bytes() == b'head\n'
+    assert (project / 'both.tsx').read_bytes() == b'local\n'
+    assert not (project / 'both.tsx.orig').exists()
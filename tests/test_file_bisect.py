@@ -0,0 +1,35 @@
+from datetime import datetime, timedelta
+
+from cursor_history.conflicts import HashCache
+from cursor_history.file_bisect import Predicate, bisect_last, good_position
+
+
+def _versions(tmp_path, contents):
+    start = datetime(2024, 5, 1)
+    versions = []
+    for i, content in enumerate(contents):
+        history_file = tmp_path / f'v{i}.tsx'
+        history_file.write_bytes(content)
+        versions.append({'history_file': history_file, 'timestamp': start + timedelta(hours=i)})
+    return versions
+
+
+def _contains(needle):
+    return Predicate(lambda view: view.obj.find(needle) >= 0, hash_cache=HashCache())
+
+
+def test_snippet_added_mid_history(tmp_path):
+    contents = [b'<Checkout />', b'<Checkout />', b'<KakaoPay />', b'<KakaoPay />\n<Toss />',
+                b'<Toss />', b'<Toss />\n<Naver />']
+    versions = _versions(tmp_path, contents)
+    assert bisect_last(versions, _contains(b'KakaoPay')) is versions[3]
+    assert bisect_last(versions, _contains(b'Stripe')) is None
+
+
+def test_good_bound_bisects_after_it(tmp_path):
+    contents = [b'a', b'a KakaoPay', b'a KakaoPay', b'a KakaoPay', b'a', b'a']
+    versions = _versions(tmp_path, contents)
+    good = good_position(versions, versions[1]['timestamp'] + timedelta(minutes=30))
+    assert good == 1
+    assert bisect_last(versions, _contains(b'KakaoPay'), good) is versions[3]
+    assert bisect_last(versions, _contains(b'KakaoPay'), 0) is None
@@ -0,0 +1,30 @@
+from pathlib import Path
+
+from cursor_history.filters import compile_filter
+from cursor_history.paths import decode_file_uri, encode_file_uri
+
+
+def test_posix_uri_keeps_root():
+    assert decode_file_uri('file:///tmp/p/src/a%20b.tsx') == Path('/tmp/p/src/a b.tsx')
+
+
+def test_windows_uri_drops_slash_before_drive():
+    assert str(decode_file_uri('file:///c%3A/Users/x/a.tsx')).replace('\\', '/') == 'c:/Users/x/a.tsx'
+
+
+def test_uri_round_trip():
+    for uri in ('file:///tmp/p/src/a%20b.tsx', 'file:///c%3A/Users/x/a.tsx'):
+        assert encode_file_uri(decode_file_uri(uri)) == uri
+
+
+def test_rooted_glob_matches_from_project_root():
+    path_filter = compile_filter(globs=['src/**'], exclude_globs=['**/node_modules/**'], prefixes=['/p/site'])
+    assert path_filter.match_path('/p/site/src/pages/a.tsx')
+    assert not path_filter.match_path('/p/site/lib/src/a.tsx')
+    assert not path_filter.match_path('/p/site/node_modules/x/src/a.js')
+
+
+def test_name_glob_matches_any_depth():
+    path_filter = compile_filter(globs=['*.tsx'], prefixes=['/p/site'])
+    assert path_filter.match_path('/p/site/src/a/b.tsx')
+    assert not path_filter.match_path('/p/site/src/a/b.ts')
@@ -0,0 +1,25 @@
+import os
+
+from cursor_history import tree_bisect
+
+
+def test_materialize_without_symlink_permission(tmp_path, monkeypatch, capsys):
+    project = tmp_path / 'project'
+    (project / 'node_modules' / 'react').mkdir(parents=True)
+    (project / 'package.json').write_text('{}')
+    snapshot = tmp_path / 'snapshot'
+    snapshot.write_text('export default 1\n')
+
+    def no_symlink(*args, **kwargs):
+        raise OSError(1314, "A required privilege is not held by the client")
+
+    monkeypatch.setattr(os, 'symlink', no_symlink)
+    scratch = tmp_path / 'scratch'
+    scratch.mkdir()
+    tree_bisect.materialize({'src/a.ts': {'history_file': snapshot}}, scratch, project, prefix='src')
+
+    assert (scratch / 'src' / 'a.ts').read_text() == 'export default 1\n'
+    assert (scratch / 'package.json').exists()
+    if os.name != 'nt':
+        assert not (scratch / 'node_modules').exists()
+        assert 'node_modules' in capsys.readouterr().out
@@ -0,0 +1,49 @@
+import json
+
+from cursor_history import restore, scan
+from cursor_history.paths import encode_file_uri
+
+
+def _history(tmp_path, files):
+    history = tmp_path / 'History'
+    for i, (path, content) in enumerate(files):
+        history_dir = history / f'{i:08x}'
+        history_dir.mkdir(parents=True)
+        (history_dir / 'a1.tsx').write_text(content)
+        entries = {'version': 1, 'resource': encode_file_uri(str(path)),
+                   'entries': [{'id': 'a1.tsx', 'timestamp': 1714521600000 + i}]}
+        (history_dir / 'entries.json').write_text(json.dumps(entries))
+    return history
+
+
+def test_restore_plans_several_projects_in_one_walk(tmp_path, monkeypatch, capsys):
+    site, functions, other = tmp_path / 'site', tmp_path / 'site' / 'supabase' / 'functions', tmp_path / 'other'
+    history = _history(tmp_path, [(site / 'src' / 'a.tsx', 'a'), (functions / 'pay' / 'index.ts', 'b'),
+                                  (tmp_path / 'admin' / 'c.ts', 'c'), (other / 'd.ts', 'd')])
+    walks = []
+
+    def counting_scan(*args, **kwargs):
+        walks.append(args)
+        return scan.scan_history(*args, **kwargs)
+
+    monkeypatch.setattr(restore, 'scan_history', counting_scan)
+    assert restore.main(['--history', str(history), '--project', str(site), '--project', str(functions),
+                         '--project', str(other), '--dry-run']) == 0
+    out = capsys.readouterr().out
+
+    assert len(walks) == 1
+    assert '복구할 파일 3개' in out
+    assert str(site / 'src' / 'a.tsx') in out
+    assert str(functions / 'pay' / 'index.ts') in out
+    assert out.count('index.ts') == 1
+    assert 'c.ts' not in out
+
+
+def test_scan_groups_by_project(tmp_path, capsys):
+    site, other = tmp_path / 'site', tmp_path / 'other'
+    history = _history(tmp_path, [(site / 'src' / 'a.tsx', 'a'), (other / 'd.ts', 'd')])
+    assert scan.main(['--history', str(history), '--project', str(site), '--project', str(other)]) == 0
+    out = capsys.readouterr().out
+    assert f'[{site}] 파일 1개' in out
+    assert f'[{other}] 파일 1개' in out
+    assert '파일 2개, 버전 2개' in out